@@ -0,0 +1,52 @@
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.resolve()
+SRC = ROOT / "src"
+
+# usage: python scripts/startup_bench.py [repeat] [product.json]
+
+
+def measure(args: list[str], repeat: int):
+    result = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "aexpy"] + args,
+            cwd=SRC,
+            check=True,
+            capture_output=True,
+        )
+        result.append(time.perf_counter() - start)
+    return result
+
+
+def report(name: str, times: list[float]):
+    print(
+        f"{name:<12} min {min(times):.3f}s  median {statistics.median(times):.3f}s  max {max(times):.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    with tempfile.TemporaryDirectory() as temp:
+        if len(sys.argv) > 2:
+            product = Path(sys.argv[2]).resolve()
+        else:
+            product = Path(temp) / "distribution.json"
+            product.write_text('{"release": {"project": "demo", "version": "1.0"}}')
+
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", "pass"], check=True)
+            times.append(time.perf_counter() - start)
+        report("interpreter", times)
+        report("--version", measure(["--version"], repeat))
+        report("--help", measure(["--help"], repeat))
+        report("view", measure(["view", str(product)], repeat))
@@ -3,6 +3,7 @@ import os
 import pathlib
 from datetime import datetime
 from functools import cache
+from typing import Callable
 
 __version__ = "0.4.4"
 
@@ -49,12 +50,39 @@ def runInContainer():
 CANDIDATE_ENV_MANAGER = ["micromamba", "mamba", "conda"]
 
 
-@cache
-def getEnvironmentManager():
-    env = os.getenv("AEXPY_ENV_PROVIDER")
-    if env in CANDIDATE_ENV_MANAGER:
-        return env
-    # auto detect
+def persistentDetection(name: str, detect: Callable[[], str]) -> str:
+    """Return the detected value persisted in the cache directory, detected again if PATH changes."""
+
+    import hashlib
+    import json
+
+    key = hashlib.sha1(os.getenv("PATH", "").encode()).hexdigest()
+    file = getCacheDirectory() / "detection.json"
+    try:
+        data = json.loads(file.read_text())
+        assert isinstance(data, dict)
+    except Exception:
+        data = {}
+
+    entry = data.get(name)
+    if isinstance(entry, dict) and entry.get("path") == key:
+        value = entry.get("value")
+        if isinstance(value, str):
+            return value
+
+    value = detect()
+    data[name] = {"path": key, "value": value}
+    try:
+        file.parent.mkdir(parents=True, exist_ok=True)
+        temp = file.with_suffix(f".{os.getpid()}.tmp")
+        temp.write_text(json.dumps(data))
+        os.replace(temp, file)
+    except OSError:
+        pass
+    return value
+
+
+def detectEnvironmentManager():
     import subprocess
 
     for env in CANDIDATE_ENV_MANAGER:
@@ -70,3 +98,11 @@ def getEnvironmentManager():
         except Exception:
             pass
     return "micromamba"
+
+
+@cache
+def getEnvironmentManager():
+    env = os.getenv("AEXPY_ENV_PROVIDER")
+    if env in CANDIDATE_ENV_MANAGER:
+        return env
+    return persistentDetection("env-manager", detectEnvironmentManager)
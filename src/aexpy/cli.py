@@ -1,24 +1,26 @@
 import code
 import json
 import logging
+import os
+import shutil
 import sys
 import zipfile
 from dataclasses import dataclass
-from io import BytesIO, TextIOWrapper
+from io import TextIOWrapper
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import IO, Any, Literal, cast, override
+from typing import IO, TYPE_CHECKING, Any, Literal, cast, override
 
 import click
 
 from . import (BUILD_DATE, SHORT_COMMIT_ID, __version__, initializeLogging,
                runInContainer)
-from .models import (ApiDescription, ApiDifference, Distribution, ProduceState,
-                     Product, Release, Report)
-from .producers import ProduceContext, produce
-from .services import ServiceProvider, getService, loadServiceFromCode
 
-DEFAULT_SERVICE = getService()
+if TYPE_CHECKING:
+    # models and services are imported when a command runs, to start quickly
+    from .models import ApiDescription, Distribution, Product
+    from .producers import ProduceContext
+    from .services import ServiceProvider
 
 
 @dataclass
@@ -38,7 +40,19 @@ class CliOptions:
 
 @dataclass
 class CliContext(CliOptions):
-    service: ServiceProvider = DEFAULT_SERVICE
+    provider: "ServiceProvider | None" = None
+
+    @property
+    def service(self, /) -> "ServiceProvider":
+        if self.provider is None:
+            from .services import getService
+
+            self.provider = getService()
+        return self.provider
+
+    @service.setter
+    def service(self, /, value: "ServiceProvider"):
+        self.provider = value
 
 
 class AliasedGroup(click.Group):
@@ -99,13 +113,32 @@ def StreamProductSaver(
         return StreamProductSaver(target, logStream)
 
 
-def exitWithContext[T: Product](context: ProduceContext[T]):
+def exitWithContext[T: Product](context: "ProduceContext[T]"):
+    from .models import ProduceState
+
     if context.product.state == ProduceState.Success:
         exit(0)
     print(f"Failed to process: {context.exception}", file=sys.stderr)
     exit(1)
 
 
+def spoolStream(stream: IO[bytes], target: Path) -> Path:
+    """Place the stream content at the target without reading it into memory.
+
+    A stream of a regular file is symlinked, others are written in chunks."""
+
+    name = getattr(stream, "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        try:
+            os.symlink(os.path.abspath(name), target)
+            return target
+        except OSError:
+            pass
+    with open(target, "wb") as file:
+        shutil.copyfileobj(stream, file, 1 << 20)
+    return target
+
+
 def versionMessage():
     parts = [
         "%(prog)s v%(version)s",
@@ -183,6 +216,8 @@ def main(
     logger = logging.getLogger()
 
     if service is not None:
+        from .services import loadServiceFromCode
+
         try:
             clictx.service = loadServiceFromCode(service.read())
             logger.info(f"Loaded service {clictx.service.name}: {clictx.service}")
@@ -195,7 +230,7 @@ def main(
 
 
 def preprocessCore(
-    service: ServiceProvider,
+    service: "ServiceProvider",
     path: Path,
     module: list[str] | None = None,
     project: str = "",
@@ -205,10 +240,14 @@ def preprocessCore(
     mode: (
         Literal["src"] | Literal["dist"] | Literal["wheel"] | Literal["release"]
     ) = "src",
+    logger: logging.Logger | None = None,
+    selective: bool = False,
 ):
-    from .models import Distribution
+    from .models import Distribution, Release
+    from .producers import produce
 
     dependencies = list(depends or [])
+    cacheDir: Path | None = None
     if requirements:
         dependencies.extend(
             [
@@ -226,6 +265,7 @@ def preprocessCore(
             dependencies=dependencies,
             pyversion=pyversion,
         ),
+        logger=logger,
         service=service.name,
     ) as context:
         if mode == "release":
@@ -249,7 +289,10 @@ def preprocessCore(
             else:
                 # a cache path, from release download
                 assert context.product.wheelFile, "The wheel path should be a file."
-            with context.using(WheelUnpackPreprocessor(cacheDir=path)) as producer:
+            cacheDir = path
+            with context.using(
+                WheelUnpackPreprocessor(cacheDir=path, selective=selective)
+            ) as producer:
                 producer.preprocess(context.product)
             mode = "dist"
 
@@ -265,7 +308,7 @@ def preprocessCore(
         assert path.is_dir(), "The target path should be a directory."
 
         context = service.preprocess(
-            context.product, logger=context.logger, context=context
+            context.product, logger=context.logger, context=context, cacheDir=cacheDir
         )
         if not context.product.pyversion:
             context.product.pyversion = "3.12"
@@ -274,12 +317,18 @@ def preprocessCore(
 
 
 def extractCore(
-    service: ServiceProvider,
-    data: Distribution,
+    service: "ServiceProvider",
+    data: "Distribution",
     env: str = "",
     temp: bool = False,
+    logger: logging.Logger | None = None,
 ):
-    with produce(ApiDescription(distribution=data), service=service.name) as context:
+    from .models import ApiDescription
+    from .producers import produce
+
+    with produce(
+        ApiDescription(distribution=data), logger=logger, service=service.name
+    ) as context:
         if env:
             from .environments import SingleExecutionEnvironmentBuilder
             from .extracting.environment import getExtractorEnvironment
@@ -349,6 +398,12 @@ def extractCore(
 )
 @click.option("-w", "--wheel", "mode", flag_value="wheel", help="Wheel file mode.")
 @click.option("-r", "--release", "mode", flag_value="release", help="Release ID mode.")
+@click.option(
+    "--selective",
+    is_flag=True,
+    default=False,
+    help="Unpack only metadata and Python sources of wheels, deduplicated by hardlinks.",
+)
 def preprocess(
     ctx: click.Context,
     path: Path,
@@ -361,6 +416,7 @@ def preprocess(
     mode: (
         Literal["src"] | Literal["dist"] | Literal["wheel"] | Literal["release"]
     ) = "src",
+    selective: bool = False,
 ):
     """Preprocess and generate a package distribution file.
 
@@ -396,6 +452,7 @@ def preprocess(
         depends=depends,
         requirements=requirements,
         mode=mode,
+        selective=selective,
     )
 
     result = context.product
@@ -487,6 +544,8 @@ def extract(
 
     zip -r - ./aexpy | aexpy extract - api.json -s
     """
+    from .models import Distribution, ProduceState
+
     clictx = ctx.ensure_object(CliContext)
 
     if mode == "json":
@@ -504,9 +563,14 @@ def extract(
                 )
             elif mode == "src":
                 unpackedDir = tmpdir / "src"
-                with BytesIO(distribution.read()) as bio:
-                    with zipfile.ZipFile(bio) as f:
-                        f.extractall(unpackedDir)
+                # zipfile seeks in the archive, so only unseekable streams are spooled
+                archive = (
+                    distribution
+                    if distribution.seekable()
+                    else spoolStream(distribution, tmpdir / "src.zip")
+                )
+                with zipfile.ZipFile(archive) as f:
+                    f.extractall(unpackedDir)
                 context = preprocessCore(
                     service=clictx.service,
                     path=unpackedDir,
@@ -521,8 +585,7 @@ def extract(
                         pass
                 wheelName = wheelName.removesuffix(".whl") or "temp"
 
-                wheelFile = tmpdir / f"{wheelName}.whl"
-                wheelFile.write_bytes(distribution.read())
+                wheelFile = spoolStream(distribution, tmpdir / f"{wheelName}.whl")
                 context = preprocessCore(
                     service=clictx.service,
                     path=wheelFile,
@@ -558,7 +621,34 @@ def extract(
 @click.argument("old", type=click.File("rb"))
 @click.argument("new", type=click.File("rb"))
 @click.argument("difference", type=click.File("wb"))
-def diff(ctx: click.Context, old: IO[bytes], new: IO[bytes], difference: IO[bytes]):
+@click.option(
+    "-p",
+    "--previous",
+    type=click.File("rb"),
+    default=None,
+    help="Previous API difference to reuse for unchanged entries, requires its index.",
+)
+@click.option(
+    "--index",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Fingerprint index file, read for the previous difference and written for this one.",
+)
+@click.option(
+    "--profile",
+    type=click.File("w"),
+    default=None,
+    help="Output file of the profile of constraints and rules (in json format).",
+)
+def diff(
+    ctx: click.Context,
+    old: IO[bytes],
+    new: IO[bytes],
+    difference: IO[bytes],
+    previous: IO[bytes] | None = None,
+    index: Path | None = None,
+    profile: IO[str] | None = None,
+):
     """Diff the API descriptions and find all changes.
 
     OLD describes the input API description file of the old distribution (in json format, use `-` for stdin).
@@ -574,27 +664,62 @@ def diff(ctx: click.Context, old: IO[bytes], new: IO[bytes], difference: IO[byte
     aexpy diff ./api1.json ./api2.json ./changes.json
 
     echo "," | cat ./api1.json - ./api2.json | aexpy diff - - ./changes.json
+
+    aexpy diff ./api1.json ./api2.json ./changes.json --index ./changes.index.json
+
+    aexpy diff ./api1.json ./api2-fixed.json ./changes2.json -p ./changes.json --index ./changes.index.json
+
+    aexpy diff ./api1.json ./api2.json ./changes.json --profile ./changes.profile.json
     """
+    from .models import ApiDescription, ApiDifference
+    from .models.difference import DiffIndex
+    from .producers import Profiler
+
     clictx = ctx.ensure_object(CliContext)
 
     if old.name == sys.stdin.name and new.name == sys.stdin.name:
+        from pydantic import TypeAdapter
+
         try:
-            oldDataDict, newDataDict = json.loads(f"[{old.read().decode()}]")
+            oldData, newData = TypeAdapter(
+                tuple[ApiDescription, ApiDescription]
+            ).validate_json(b"[" + old.read() + b"]")
         except:
             raise click.BadArgumentUsage(
                 "Failed to parse two API descriptions from stdin"
             )
-        oldData = ApiDescription.model_validate(oldDataDict)
-        newData = ApiDescription.model_validate(newDataDict)
     else:
         oldData = StreamProductLoader(old).load(ApiDescription)
         newData = StreamProductLoader(new).load(ApiDescription)
 
-    context = clictx.service.diff(oldData, newData)
+    lastDiff = None
+    if previous is not None:
+        if index is None or not index.is_file():
+            raise click.BadOptionUsage(
+                "index", "The index of the previous difference is required."
+            )
+        lastDiff = (
+            StreamProductLoader(previous).load(ApiDifference),
+            DiffIndex.model_validate_json(index.read_text()),
+        )
+
+    diffIndex = DiffIndex() if index is not None else None
+
+    profiler = Profiler() if profile is not None else None
+
+    context = clictx.service.diff(
+        oldData, newData, previous=lastDiff, index=diffIndex, profiler=profiler
+    )
 
     result = context.product
     StreamProductSaver(difference, gzip=clictx.compress).save(result, context.log)
 
+    if index is not None and diffIndex is not None:
+        index.write_text(diffIndex.model_dump_json())
+
+    if profile is not None and profiler is not None:
+        json.dump(profiler.dump(), profile, indent=2)
+
     print(result.overview(), file=sys.stderr)
 
     if clictx.interact:
@@ -618,6 +743,8 @@ def report(ctx: click.Context, difference: IO[bytes], report: IO[bytes]):
 
     aexpy report ./changes.json ./report.json
     """
+    from .models import ApiDifference
+
     clictx = ctx.ensure_object(CliContext)
 
     data = StreamProductLoader(difference).load(ApiDifference)
@@ -644,18 +771,19 @@ def view(ctx: click.Context, file: IO[bytes]):
 
     Supports distribution, api-description, api-difference, report and  file (in json format).
     """
+    from .models import Report
+
     clictx = ctx.ensure_object(CliContext)
 
     cache = StreamProductLoader(file)
 
     from .io import load
 
-    try:
+    def fallback(data: dict):
+        # statistics are rare, so import them only for data of other types
         from .tools.stats import StatSummary
 
-        fallback = lambda data: StatSummary.model_validate(data)
-    except Exception:
-        fallback = None
+        return StatSummary.model_validate(data)
 
     result = load(cache.raw(), fallback)
 
@@ -1,16 +1,30 @@
+from logging import Logger
 from typing import override
 
+from ..models import ApiDifference
+from ..models.difference import DiffIndex
 from ..producers import produce
 from . import Differ
 
 
 class DefaultDiffer(Differ):
+    def __init__(self, /, logger: Logger | None = None):
+        super().__init__(logger)
+        self.previous: tuple[ApiDifference, DiffIndex] | None = None
+        """Previous difference and its index for incremental diff."""
+        self.index: DiffIndex | None = None
+        """Index to fill with fingerprints of the diffed descriptions."""
+
     @override
     def diff(self, /, old, new, product):
         with produce(product, self.logger, raising=True) as context:
+            context.profiler = self.profiler
             from .differs.default import DefaultDiffer
 
-            with context.using(DefaultDiffer()) as producer:
+            differ = DefaultDiffer()
+            differ.previous = self.previous
+            differ.index = self.index
+            with context.using(differ) as producer:
                 producer.diff(old, new, product)
 
             from .evaluators.default import DefaultEvaluator
@@ -1,5 +1,6 @@
+import threading
 from dataclasses import dataclass, field
-from typing import Callable, Iterable, Literal, Type, cast, overload
+from typing import Any, Callable, Iterable, Literal, Type, cast, overload
 
 from ...models import ApiDescription, DiffEntry
 from ...models.description import ApiEntry
@@ -9,6 +10,25 @@ type T_Checker = Callable[
     Iterable[DiffEntry],
 ]
 
+_pairState = threading.local()
+
+
+def pairCache() -> dict[Any, Any]:
+    """Return the cache shared by constraints checking the current entry pair in this thread."""
+
+    cache = getattr(_pairState, "cache", None)
+    if cache is None:
+        cache = _pairState.cache = {}
+    return cache
+
+
+def clearPairCache():
+    """Drop values cached for the entry pair, called after all constraints check it."""
+
+    cache = getattr(_pairState, "cache", None)
+    if cache:
+        cache.clear()
+
 
 class DiffConstraint:
     """
@@ -27,6 +47,16 @@ class DiffConstraint:
             checker if checker else cast(T_Checker, lambda a, b, old, new: [])
         )
         self.kind = kind
+        self.contextual = False
+        """Whether the checker may report changes by other entries of the descriptions.
+
+        Other constraints are skipped for entry pairs with the same structural hash."""
+
+    def withcontext(self, /):
+        """Mark the constraint to run even for structurally unchanged entry pairs."""
+
+        self.contextual = True
+        return self
 
     def askind(self, /, kind: str):
         """Set kind."""
@@ -93,6 +123,12 @@ def diffcons(
     return DiffConstraint(checker.__name__, checker)
 
 
+def contextual(constraint: DiffConstraint) -> DiffConstraint:
+    """Mark the diff constraint to need other entries of the descriptions as context."""
+
+    return constraint.withcontext()
+
+
 @overload
 def typedCons[
     TEntry: ApiEntry
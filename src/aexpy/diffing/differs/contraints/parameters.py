@@ -6,12 +6,25 @@ from typing import Callable, Iterable, Iterator
 from ....models import ApiDescription
 from ....models.description import FunctionEntry, Parameter, ParameterKind
 from ....models.difference import DiffEntry
-from ..checkers import DiffConstraintCollection, typedCons
+from ..checkers import DiffConstraintCollection, pairCache, typedCons
 
 ParameterConstraints = DiffConstraintCollection()
 
 
 def matchParameters(a: FunctionEntry, b: FunctionEntry):
+    """Return the matched parameter pairs, shared by the parameter constraints of the entry pair."""
+
+    cache = pairCache()
+    key = matchParameters, a.id, b.id
+    item = cache.get(key)
+    if item is not None and item[0] is a and item[1] is b:
+        return item[2]
+    result = list(iterMatchedParameters(a, b))
+    cache[key] = a, b, result
+    return result
+
+
+def iterMatchedParameters(a: FunctionEntry, b: FunctionEntry):
     def inner() -> Iterator[tuple[Parameter | None, Parameter | None]]:
         for x, y in zip_longest(a.positionalOnlys, b.positionalOnlys):
             if x is None:
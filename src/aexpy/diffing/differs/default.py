@@ -1,14 +1,18 @@
+import logging
+import multiprocessing
+import os
 from hashlib import blake2b
 from logging import Logger
 from typing import Iterable, override
-from uuid import uuid1
 
-from ...models import ApiDescription
-from ...models.description import ApiEntry
-from ...models.difference import DiffEntry
+from ...models import ApiDescription, ApiDifference
+from ...models.description import (ApiEntry, ClassEntry, CollectionEntry,
+                                   entryFingerprint)
+from ...models.difference import DiffEntry, DiffIndex
+from ...producers import Profiler
 from ...utils import isLocal
 from .. import Differ
-from .checkers import DiffConstraint
+from .checkers import DiffConstraint, clearPairCache
 
 
 def hashDiffEntry(entry: DiffEntry):
@@ -17,6 +21,70 @@ def hashDiffEntry(entry: DiffEntry):
     ).hexdigest()
 
 
+def relatedIds(description: ApiDescription, id: str):
+    """Ids of entries that diffing the entry may look up, by resolving its parents, bases and members."""
+
+    result = {id}
+    names = id.split(".")
+    for i in range(1, len(names) + 1):
+        prefix = ".".join(names[:i])
+        result.add(prefix)
+        entry = description[prefix]
+        if not isinstance(entry, CollectionEntry):
+            continue
+        if i == len(names):
+            result.update(entry.members.values())
+            continue
+        collections = [entry]
+        if isinstance(entry, ClassEntry):
+            result.update(entry.mros)
+            collections.extend(
+                base
+                for base in (description[mro] for mro in entry.mros)
+                if isinstance(base, ClassEntry)
+            )
+        for collection in collections:
+            target = collection.members.get(names[i])
+            if target:
+                result.add(target)
+    return result
+
+
+type DiffTask = tuple[ApiEntry | None, ApiEntry | None]
+
+
+_forked: "tuple[ConstraintDiffer, ApiDescription, ApiDescription] | None" = None
+"""Differ state inherited by forked workers."""
+
+
+def _diffShard(tasks: list[tuple[int, str | None, str | None]]):
+    assert _forked is not None
+    differ, old, new = _forked
+    if differ.profiler is not None:
+        # records of each shard are merged by the parent
+        differ.profiler = Profiler()
+    result = [
+        (
+            index,
+            list(
+                differ.process(
+                    old[oldId] if oldId else None,
+                    new[newId] if newId else None,
+                    old,
+                    new,
+                )
+            ),
+        )
+        for index, oldId, newId in tasks
+    ]
+    return result, differ.profiler
+
+
+def shardKey(id: str):
+    """Shard entries by module path, the package and its direct submodule."""
+    return ".".join(id.split(".", 2)[:2])
+
+
 class ConstraintDiffer(Differ):
     """Diff based on diff constraints."""
 
@@ -25,12 +93,23 @@ class ConstraintDiffer(Differ):
         /,
         logger: Logger | None = None,
         constraints: list[DiffConstraint] | None = None,
+        workers: int = 1,
     ) -> None:
         super().__init__(logger)
         self.constraints: list[DiffConstraint] = constraints or []
+        self.workers = workers
+        """Count of forked processes diffing entries, 1 to diff in process."""
+        self.previous: tuple[ApiDifference, DiffIndex] | None = None
+        """Previous difference and its index, whose diff entries are reused for unchanged entries."""
+        self.index: DiffIndex | None = None
+        """Index to fill with fingerprints of the diffed descriptions."""
+        self.unchanged: set[str] = set()
+        """Ids of entries with the same structural hash in both descriptions."""
 
-    @override
-    def diff(self, /, old, new, product):
+    def tasks(self, /, old: ApiDescription, new: ApiDescription) -> list[DiffTask]:
+        """Entry pairs to diff, in the order their diff entries are merged."""
+
+        result: list[DiffTask] = []
         for v in old:
             if isLocal(v.id):
                 # ignore unaccessable local elements
@@ -38,23 +117,262 @@ class ConstraintDiffer(Differ):
             newentry = new[v.id]
             if newentry is not None and isLocal(newentry.id):
                 continue
-            for e in self.process(v, newentry, old, new):
-                if e.id in product.entries:
-                    self.logger.warning(f"Existed entry id  {e.id}: {e}")
-                    e.id += f"-{uuid1()}"
-                    assert (
-                        e.id not in product.entries
-                    ), f"Still existed entry id {e.id}: {e}"
-                product.entries[e.id] = e
+            result.append((v, newentry))
 
         for v in new:
             if isLocal(v.id):
                 # ignore unaccessable local elements
                 continue
             if v.id not in old:
-                product.entries.update(
-                    {e.id: e for e in self.process(None, v, old, new)}
+                result.append((None, v))
+        return result
+
+    def diffParallel(
+        self,
+        /,
+        tasks: list[DiffTask],
+        old: ApiDescription,
+        new: ApiDescription,
+    ):
+        """Diff tasks in forked workers sharing both descriptions, results are in task order."""
+
+        global _forked
+
+        shards: dict[str, list[tuple[int, str | None, str | None]]] = {}
+        for index, (oldEntry, newEntry) in enumerate(tasks):
+            entry = oldEntry or newEntry
+            assert entry is not None
+            shards.setdefault(shardKey(entry.id), []).append(
+                (
+                    index,
+                    oldEntry.id if oldEntry else None,
+                    newEntry.id if newEntry else None,
                 )
+            )
+
+        self.logger.info(
+            f"Diff {len(tasks)} entries in {len(shards)} shards by {self.workers} workers."
+        )
+
+        results: list[list[DiffEntry]] = [[] for _ in tasks]
+        _forked = self, old, new
+        try:
+            with multiprocessing.get_context("fork").Pool(self.workers) as pool:
+                for shard, profiler in pool.imap_unordered(
+                    _diffShard, [shards[key] for key in sorted(shards)]
+                ):
+                    if self.profiler is not None and profiler is not None:
+                        self.profiler.merge(profiler)
+                    for index, entries in shard:
+                        results[index] = entries
+        finally:
+            _forked = None
+        return results
+
+    def pruned(self, /, old: ApiDescription, new: ApiDescription):
+        """Ids of entries in subtrees with the same Merkle digest in both descriptions.
+
+        Subtrees are compared from the roots, an unchanged package is one comparison."""
+
+        result: set[str] = set()
+        if not old.digests or not new.digests:
+            return result
+
+        children = old.entryChildren
+        stack = list(children.get("", []))
+        subtrees = 0
+        while stack:
+            id = stack.pop()
+            digest = old.digests.get(id)
+            if digest is None or new.digests.get(id) != digest:
+                stack.extend(children.get(id, []))
+                continue
+            subtrees += 1
+            subtree = [id]
+            while subtree:
+                item = subtree.pop()
+                result.add(item)
+                subtree.extend(children.get(item, []))
+
+        self.logger.info(
+            f"Prune {subtrees} unchanged subtrees with {len(result)} entries by digests."
+        )
+        return result
+
+    def reuse(
+        self,
+        /,
+        tasks: list[DiffTask],
+        old: ApiDescription,
+        new: ApiDescription,
+        index: DiffIndex,
+    ):
+        """Diff entries of the previous difference for tasks whose entry and related entries are unchanged."""
+
+        assert self.previous is not None
+        previous, previousIndex = self.previous
+
+        changed: set[str] = set()
+        for current, last in (
+            (index.old, previousIndex.old),
+            (index.new, previousIndex.new),
+        ):
+            changed.update(
+                id
+                for id in current.keys() | last.keys()
+                if current.get(id) != last.get(id)
+            )
+
+        def current(description: ApiDescription, entry: ApiEntry | None):
+            # fingerprints leave out locations and docs, so refer to the entries extracted this time
+            if entry is None:
+                return None
+            return description[entry.id] or entry
+
+        result: dict[int, list[DiffEntry]] = {}
+        for i, (oldEntry, newEntry) in enumerate(tasks):
+            entry = oldEntry or newEntry
+            assert entry is not None
+            raws = previousIndex.entries.get(entry.id)
+            if raws is None or not raws.keys() <= previous.entries.keys():
+                continue
+            if not changed.isdisjoint(
+                relatedIds(old, entry.id)
+            ) or not changed.isdisjoint(relatedIds(new, entry.id)):
+                continue
+            result[i] = [
+                raw.model_copy(
+                    update={
+                        "old": current(old, previous.entries[id].old),
+                        "new": current(new, previous.entries[id].new),
+                    }
+                )
+                for id, raw in raws.items()
+            ]
+
+        self.logger.info(
+            f"Reuse previous diff entries for {len(result)}/{len(tasks)} entries, {len(changed)} entries changed."
+        )
+        return result
+
+    def merge(
+        self,
+        /,
+        product: ApiDifference,
+        entries: list[DiffEntry],
+        unique: bool,
+        raws: dict[str, DiffEntry] | None = None,
+    ):
+        """Add diff entries to the product, and their copies before evaluation to raws if given."""
+
+        for e in entries:
+            if raws is not None:
+                raw = e.model_copy(update={"old": None, "new": None})
+            if unique and e.id in product.entries:
+                self.logger.warning(f"Existed entry id  {e.id}: {e}")
+                base, suffix = e.id, 1
+                while f"{base}-{suffix}" in product.entries:
+                    suffix += 1
+                e.id = f"{base}-{suffix}"
+            product.entries[e.id] = e
+            if raws is not None:
+                raws[e.id] = raw
+
+    @override
+    def diff(self, /, old, new, product):
+        tasks = self.tasks(old, new)
+
+        index = self.index
+        if index is None and self.previous is not None:
+            index = DiffIndex()
+        if index is not None:
+            index.old = {entry.id: entryFingerprint(entry) for entry in old}
+            index.new = {entry.id: entryFingerprint(entry) for entry in new}
+            index.entries = {}
+
+        results: dict[int, list[DiffEntry]] = {}
+        if self.previous is not None:
+            assert index is not None
+            results = self.reuse(tasks, old, new, index)
+        pending = [i for i in range(len(tasks)) if i not in results]
+
+        pruned = self.pruned(old, new)
+        if pruned and not any(c.contextual for c in self.constraints):
+            # identical entries produce no diff entries without contextual constraints
+            for i in pending:
+                oldEntry, newEntry = tasks[i]
+                if (
+                    oldEntry is not None
+                    and newEntry is not None
+                    and oldEntry.id in pruned
+                ):
+                    results[i] = []
+            pending = [i for i in pending if i not in results]
+
+        self.unchanged = {
+            oldEntry.id
+            for oldEntry, newEntry in (tasks[i] for i in pending)
+            if oldEntry is not None
+            and newEntry is not None
+            and oldEntry.__class__ == newEntry.__class__
+            and (
+                oldEntry.id in pruned
+                or entryFingerprint(oldEntry) == entryFingerprint(newEntry)
+            )
+        }
+        self.logger.info(
+            f"Skip constraints for {len(self.unchanged)}/{len(pending)} ({len(self.unchanged) / max(len(pending), 1):.1%}) structurally unchanged entries."
+        )
+
+        parallel = self.workers > 1
+        if parallel and "fork" not in multiprocessing.get_all_start_methods():
+            self.logger.warning("Fork is not supported, diff entries in process.")
+            parallel = False
+
+        if parallel:
+            computed = self.diffParallel([tasks[i] for i in pending], old, new)
+        else:
+            computed = (list(self.process(*tasks[i], old, new)) for i in pending)
+        for i, entries in zip(pending, computed):
+            results[i] = entries
+
+        for i, (oldEntry, newEntry) in enumerate(tasks):
+            # entries only in the new description keep the last one of the same id
+            raws = None
+            if index is not None:
+                entry = oldEntry or newEntry
+                assert entry is not None
+                raws = index.entries[entry.id] = {}
+            self.merge(product, results[i], unique=oldEntry is not None, raws=raws)
+        product.clearCache()
+
+    def check(
+        self,
+        /,
+        constraint: DiffConstraint,
+        old: ApiEntry | None,
+        new: ApiEntry | None,
+        oldDescription: ApiDescription,
+        newDescription: ApiDescription,
+    ) -> Iterable[DiffEntry]:
+        if self.profiler is None:
+            return constraint(old, new, oldDescription, newDescription)
+        return self.checkProfiled(constraint, old, new, oldDescription, newDescription)
+
+    def checkProfiled(
+        self,
+        /,
+        constraint: DiffConstraint,
+        old: ApiEntry | None,
+        new: ApiEntry | None,
+        oldDescription: ApiDescription,
+        newDescription: ApiDescription,
+    ):
+        assert self.profiler is not None
+        with self.profiler.timing("constraints", constraint.kind) as record:
+            for item in constraint(old, new, oldDescription, newDescription):
+                record.entries += 1
+                yield item
 
     def process(
         self,
@@ -64,18 +382,33 @@ class ConstraintDiffer(Differ):
         oldDescription: ApiDescription,
         newDescription: ApiDescription,
     ) -> Iterable[DiffEntry]:
-        self.logger.debug(f"Diff {old} and {new}.")
-        for constraint in self.constraints:
-            try:
-                for item in constraint(old, new, oldDescription, newDescription):
-                    if not item.id:
-                        item.id = hashDiffEntry(item)
-                    yield item
-            except Exception:
-                self.logger.error(
-                    f"Failed to diff {old} and {new} by constraints {constraint.kind} ({constraint.checker}).",
-                    exc_info=True,
-                )
+        if self.logger.isEnabledFor(logging.DEBUG):
+            # formatting entries costs more than most constraints
+            self.logger.debug(f"Diff {old} and {new}.")
+        constraints = self.constraints
+        if (
+            old is not None
+            and new is not None
+            and old.id == new.id
+            and old.id in self.unchanged
+        ):
+            constraints = [c for c in constraints if c.contextual]
+        try:
+            for constraint in constraints:
+                try:
+                    for item in self.check(
+                        constraint, old, new, oldDescription, newDescription
+                    ):
+                        if not item.id:
+                            item.id = hashDiffEntry(item)
+                        yield item
+                except Exception:
+                    self.logger.error(
+                        f"Failed to diff {old} and {new} by constraints {constraint.kind} ({constraint.checker}).",
+                        exc_info=True,
+                    )
+        finally:
+            clearPairCache()
 
 
 class DefaultDiffer(ConstraintDiffer):
@@ -84,8 +417,11 @@ class DefaultDiffer(ConstraintDiffer):
         /,
         logger: Logger | None = None,
         constraints: list[DiffConstraint] | None = None,
+        workers: int | None = None,
     ) -> None:
         constraints = constraints or []
+        if workers is None:
+            workers = int(os.getenv("AEXPY_DIFF_WORKERS") or 1)
 
         from .contraints import (aliases, attributes, classes, externals,
                                  functions, modules, parameters, types)
@@ -99,7 +435,7 @@ class DefaultDiffer(ConstraintDiffer):
         constraints.extend(aliases.AliasConstraints.constraints)
         constraints.extend(externals.ExternalConstraints.constraints)
 
-        super().__init__(logger, constraints)
+        super().__init__(logger, constraints, workers)
 
     @override
     def process(self, /, old, new, oldDescription, newDescription):
@@ -39,10 +39,15 @@ class EvalRule:
         old: ApiDescription,
         new: ApiDescription,
     ):
-        if self.kind and entry.kind != self.kind:
+        if not self.accepts(entry):
             return
         return self.checker(entry, diff, old, new)
 
+    def accepts(self, /, entry: DiffEntry):
+        """Whether the rule evaluates the kind of the entry."""
+
+        return not self.kind or entry.kind == self.kind
+
 
 @dataclass
 class EvalRuleCollection:
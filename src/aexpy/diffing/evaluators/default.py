@@ -21,13 +21,19 @@ class RuleEvaluator(Differ):
 
             for rule in self.rules:
                 try:
-                    rule(entry, product, old, new)
+                    if self.profiler is not None and rule.accepts(entry):
+                        with self.profiler.timing("rules", rule.kind or "*") as record:
+                            record.entries += 1
+                            rule(entry, product, old, new)
+                    else:
+                        rule(entry, product, old, new)
                 except Exception:
                     self.logger.error(
                         f"Failed to evaluate entry {entry.id} ({entry.message}) by rule {rule.kind} ({rule.checker}).",
                         exc_info=True,
                     )
             product.entries.update({entry.id: entry})
+        product.clearCache()
 
 
 class DefaultEvaluator(RuleEvaluator):
@@ -6,25 +6,30 @@ from logging import Logger
 from typing import override
 from uuid import uuid1
 
+from .. import persistentDetection
 from ..utils import logProcessResult
 from . import (ExecutionEnvironment, ExecutionEnvironmentBuilder,
                ExecutionEnvironmentRunner)
 
 
+def detectCommandPre():
+    envs: list[str] = json.loads(
+        subprocess.run(
+            "conda env list --json",
+            shell=True,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    )["envs"]
+    envs.sort(key=lambda x: len(x))
+    return f". {envs[0]}/etc/profile.d/conda.sh && "
+
+
 @cache
 def getCommandPre():
     if platform.system() == "Linux":
-        envs: list[str] = json.loads(
-            subprocess.run(
-                "conda env list --json",
-                shell=True,
-                capture_output=True,
-                text=True,
-                check=True,
-            ).stdout
-        )["envs"]
-        envs.sort(key=lambda x: len(x))
-        return f". {envs[0]}/etc/profile.d/conda.sh && "
+        return persistentDetection("conda-command-pre", detectCommandPre)
     return ""
 
 
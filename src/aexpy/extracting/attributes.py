@@ -17,5 +17,7 @@ class AttributeExtractor(MypyExtractor):
         from .enriching import attributes
 
         product.clearCache()
-        attributes.InstanceAttributeAstEnricher(self.logger).enrich(product)
+        attributes.InstanceAttributeAstEnricher(self.logger, self.astCache).enrich(
+            product
+        )
         product.clearCache()
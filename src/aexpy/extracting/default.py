@@ -1,3 +1,4 @@
+import os
 from logging import Logger
 from typing import override
 
@@ -6,6 +7,7 @@ from ..models import ApiDescription, Distribution
 from ..producers import ProduceContext, produce
 from ..utils import getObjectId
 from . import Extractor
+from .enriching import AstCache
 from .third.mypyserver import PackageMypyServer
 
 
@@ -13,10 +15,27 @@ class DefaultExtractor(Extractor):
     """Basic extractor that uses dynamic inspect."""
 
     def __init__(
-        self, /, logger: Logger | None = None, env: ExecutionEnvironment | None = None
+        self,
+        /,
+        logger: Logger | None = None,
+        env: ExecutionEnvironment | None = None,
+        kwargsByCallgraph: bool | None = None,
+        callgraphWorkers: int | None = None,
     ):
         super().__init__(logger=logger)
         self.env = env
+        if kwargsByCallgraph is None:
+            kwargsByCallgraph = os.getenv("AEXPY_KWARGS_CALLGRAPH", "").lower() in {
+                "1",
+                "true",
+                "yes",
+            }
+        self.kwargsByCallgraph = kwargsByCallgraph
+        """Propagate kwargs candidates along the callgraph, default from env AEXPY_KWARGS_CALLGRAPH."""
+        if callgraphWorkers is None:
+            callgraphWorkers = int(os.getenv("AEXPY_CALLGRAPH_WORKERS") or 1)
+        self.callgraphWorkers = callgraphWorkers
+        """Count of processes building the callgraph, default from env AEXPY_CALLGRAPH_WORKERS."""
 
     def base(self, /, dist: Distribution, context: ProduceContext[ApiDescription]):
         from .base import BaseExtractor
@@ -31,11 +50,12 @@ class DefaultExtractor(Extractor):
         dist: Distribution,
         context: ProduceContext[ApiDescription],
         server: PackageMypyServer | None,
+        astCache: AstCache | None = None,
     ):
         from .attributes import AttributeExtractor
 
         with context.using(
-            AttributeExtractor(serverProvider=lambda _: server)
+            AttributeExtractor(serverProvider=lambda _: server, astCache=astCache)
         ) as producer:
             producer.extract(dist, context.product)
 
@@ -45,11 +65,17 @@ class DefaultExtractor(Extractor):
         dist: Distribution,
         context: ProduceContext[ApiDescription],
         server: PackageMypyServer | None,
+        astCache: AstCache | None = None,
     ):
         from .kwargs import KwargsExtractor
 
         with context.using(
-            KwargsExtractor(serverProvider=lambda _: server)
+            KwargsExtractor(
+                serverProvider=lambda _: server,
+                astCache=astCache,
+                byCallgraph=self.kwargsByCallgraph,
+                callgraphWorkers=self.callgraphWorkers,
+            )
         ) as producer:
             producer.extract(dist, context.product)
 
@@ -82,8 +108,13 @@ class DefaultExtractor(Extractor):
                 )
                 server = None
 
-            self.attributes(dist, context, server)
-            self.kwargs(dist, context, server)
+            # sources are parsed once and shared by all AST-based enrichers
+            astCache = AstCache(self.logger)
+            try:
+                self.attributes(dist, context, server, astCache)
+                self.kwargs(dist, context, server, astCache)
+            finally:
+                astCache.clear()
             self.types(dist, context, server)
 
             self.name = context.combinedProducers(self)
@@ -1,7 +1,11 @@
+import ast
+import logging
 import textwrap
 from abc import ABC, abstractmethod
+from hashlib import blake2b
 
 from ...models import ApiDescription
+from ...models.description import ApiEntry
 
 
 class Enricher(ABC):
@@ -15,3 +19,46 @@ def clearSrc(src: str):
     return textwrap.dedent(
         "".join((line for line in lines if not line.lstrip().startswith("#")))
     )
+
+
+class AstCache:
+    """Parsed entry sources shared by the AST-based enrichers of a description."""
+
+    def __init__(self, /, logger: logging.Logger | None = None) -> None:
+        self.logger = (
+            logger.getChild("ast-cache")
+            if logger is not None
+            else logging.getLogger("ast-cache")
+        )
+        self.trees: dict[str, tuple[str, str, ast.Module | None]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, /, entry: ApiEntry) -> tuple[str, ast.Module] | None:
+        """Return the cleared source and its AST, None if the source fails to parse.
+
+        The trees are shared, so visitors must not modify them."""
+
+        digest = blake2b(entry.src.encode(), digest_size=16).hexdigest()
+        cached = self.trees.get(entry.id)
+        if cached is not None and cached[0] == digest:
+            self.hits += 1
+            _, src, astree = cached
+        else:
+            self.misses += 1
+            src = clearSrc(entry.src)
+            try:
+                astree = ast.parse(src)
+            except Exception:
+                self.logger.error(
+                    f"Failed to parse code from {entry.id}:\n{src}", exc_info=True
+                )
+                astree = None
+            self.trees[entry.id] = digest, src, astree
+        return (src, astree) if astree is not None else None
+
+    def clear(self, /):
+        self.logger.debug(
+            f"Drop {len(self.trees)} parsed sources ({self.hits} hits, {self.misses} misses)."
+        )
+        self.trees.clear()
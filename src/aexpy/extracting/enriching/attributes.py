@@ -7,7 +7,7 @@ from ...models import ApiDescription
 from ...models.description import (AttributeEntry, ClassEntry, FunctionEntry,
                                    ItemScope, isPrivate)
 from ..third.mypyserver import PackageMypyServer
-from . import Enricher, clearSrc
+from . import AstCache, Enricher
 
 
 class InstanceAttributeAstAssignGetter(NodeVisitor):
@@ -83,13 +83,19 @@ class InstanceAttributeAstAssignGetter(NodeVisitor):
 
 
 class InstanceAttributeAstEnricher(Enricher):
-    def __init__(self, /, logger: logging.Logger | None = None):
+    def __init__(
+        self,
+        /,
+        logger: logging.Logger | None = None,
+        astCache: AstCache | None = None,
+    ):
         super().__init__()
         self.logger = (
             logger.getChild("instance-attr-ast-enrich")
             if logger is not None
             else logging.getLogger("instance-attr-ast-enrich")
         )
+        self.astCache = astCache or AstCache(self.logger)
 
     @override
     def enrich(self, /, api):
@@ -106,14 +112,10 @@ class InstanceAttributeAstEnricher(Enricher):
             target = api[member]
             if not isinstance(target, FunctionEntry):
                 continue
-            src = clearSrc(target.src)
-            try:
-                astree = ast.parse(src)
-            except Exception:
-                self.logger.error(
-                    f"Failed to parse code from {target.id}:\n{src}", exc_info=True
-                )
+            parsed = self.astCache.parse(target)
+            if parsed is None:
                 continue
+            _, astree = parsed
             InstanceAttributeAstAssignGetter(target, self.logger, cls, api).visit(
                 astree
             )
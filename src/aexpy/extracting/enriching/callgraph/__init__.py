@@ -1,39 +1,141 @@
 from abc import ABC, abstractmethod
+from array import array
 from dataclasses import dataclass, field
 from typing import Any
 
 from ....models import ApiDescription
 
 
-@dataclass
+@dataclass(slots=True)
 class Argument:
     name: str = ""
-    value: Any | None = None
+    ref: str = ""
+    """Name of the variable passed as the argument, empty if the value is not a plain name."""
     iskwargs: bool = False
     raw: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Callsite:
     targets: list[str] = field(default_factory=list)
-    targetValue: Any | None = None
     arguments: list[Argument] = field(default_factory=list)
-    value: Any | None = None
     raw: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Caller:
     id: str = ""
     sites: list[Callsite] = field(default_factory=list)
 
 
-@dataclass
 class Callgraph:
-    items: dict[str, Caller] = field(default_factory=dict)
+    """Call sites of callers, with interned node ids and CSR caller-to-callee edges.
+
+    Call sites keep no AST nodes, so the callgraph can be pickled and dumped."""
+
+    def __init__(self, /) -> None:
+        self.items: dict[str, Caller] = {}
+        self.ids: list[str] = []
+        """Node ids indexed by the interned integer id."""
+        self.index: dict[str, int] = {}
+        self._offsets: array | None = None
+        self._targets: array | None = None
+
+    def intern(self, /, id: str) -> int:
+        result = self.index.get(id)
+        if result is None:
+            result = len(self.ids)
+            self.index[id] = result
+            self.ids.append(id)
+        return result
 
     def add(self, /, item: Caller):
+        self.intern(item.id)
+        for site in item.sites:
+            site.targets = [self.ids[self.intern(target)] for target in site.targets]
         self.items[item.id] = item
+        self._offsets = self._targets = None
+
+    def adjacency(self, /) -> tuple[array, array]:
+        """Return offsets and targets in CSR form.
+
+        Callees of node i are targets[offsets[i]:offsets[i+1]], without duplicates."""
+
+        if self._offsets is None or self._targets is None:
+            offsets = array("l", [0])
+            targets = array("l")
+            for id in self.ids:
+                caller = self.items.get(id)
+                if caller is not None:
+                    callees = dict.fromkeys(
+                        self.index[target]
+                        for site in caller.sites
+                        for target in site.targets
+                    )
+                    targets.extend(callees)
+                offsets.append(len(targets))
+            self._offsets, self._targets = offsets, targets
+        return self._offsets, self._targets
+
+    def callees(self, /, id: str) -> list[str]:
+        index = self.index.get(id)
+        if index is None:
+            return []
+        offsets, targets = self.adjacency()
+        return [
+            self.ids[target] for target in targets[offsets[index] : offsets[index + 1]]
+        ]
+
+    def callers(self, /) -> dict[str, list[str]]:
+        result: dict[str, list[str]] = {}
+        offsets, targets = self.adjacency()
+        for index, id in enumerate(self.ids):
+            for target in targets[offsets[index] : offsets[index + 1]]:
+                result.setdefault(self.ids[target], []).append(id)
+        return result
+
+    def dump(self, /) -> dict[str, Any]:
+        offsets, targets = self.adjacency()
+        return {
+            "ids": self.ids,
+            "offsets": offsets.tolist(),
+            "targets": targets.tolist(),
+            "items": {
+                caller.id: [
+                    [
+                        [self.index[target] for target in site.targets],
+                        [
+                            [arg.name, arg.ref, arg.iskwargs, arg.raw]
+                            for arg in site.arguments
+                        ],
+                        site.raw,
+                    ]
+                    for site in caller.sites
+                ]
+                for caller in self.items.values()
+            },
+        }
+
+    @classmethod
+    def load(cls, /, data: dict[str, Any]):
+        result = cls()
+        for id in data["ids"]:
+            result.intern(id)
+        for id, sites in data["items"].items():
+            result.items[id] = Caller(
+                id=id,
+                sites=[
+                    Callsite(
+                        targets=[result.ids[target] for target in targets],
+                        arguments=[Argument(*arg) for arg in arguments],
+                        raw=raw,
+                    )
+                    for targets, arguments, raw in sites
+                ],
+            )
+        result._offsets = array("l", data["offsets"])
+        result._targets = array("l", data["targets"])
+        return result
 
 
 class CallgraphBuilder(ABC):
@@ -1,11 +1,11 @@
 import ast
 import logging
-from ast import Call, NodeVisitor, parse
+from ast import Call, NodeVisitor
 from typing import override
 
 from ....models import ApiDescription, ClassEntry, FunctionEntry
 from ....models.description import ItemScope
-from .. import clearSrc
+from .. import AstCache
 from . import Argument, Caller, Callgraph, CallgraphBuilder, Callsite
 
 
@@ -16,20 +16,22 @@ class CallsiteGetter(NodeVisitor):
         self.src = src
 
     def visit_Call(self, /, node: Call):
-        site = Callsite(value=node)
-        site.targetValue = node.func
+        site = Callsite()
         match node.func:
             case ast.Attribute() as attr:
                 site.targets = [attr.attr]
             case ast.Name() as name:
                 site.targets = [name.id]
         for arg in node.args:
-            argu = Argument(value=arg, raw=ast.get_source_segment(self.src, arg) or "")
+            argu = Argument(
+                ref=arg.id if isinstance(arg, ast.Name) else "",
+                raw=ast.get_source_segment(self.src, arg) or "",
+            )
             site.arguments.append(argu)
         for arg in node.keywords:
             argu = Argument(
                 name=arg.arg or "<none>",
-                value=arg.value,
+                ref=arg.value.id if isinstance(arg.value, ast.Name) else "",
                 iskwargs=arg.arg is None,
                 raw=ast.get_source_segment(self.src, arg.value) or "",
             )
@@ -107,13 +109,19 @@ class FunctionResolver:
 
 
 class BasicCallgraphBuilder(CallgraphBuilder):
-    def __init__(self, /, logger: logging.Logger | None = None) -> None:
+    def __init__(
+        self,
+        /,
+        logger: logging.Logger | None = None,
+        astCache: AstCache | None = None,
+    ) -> None:
         super().__init__()
         self.logger = (
             logger.getChild("callgraph-basic")
             if logger is not None
             else logging.getLogger("callgraph-basic")
         )
+        self.astCache = astCache or AstCache(self.logger)
 
     @override
     def build(self, /, api):
@@ -123,16 +131,11 @@ class BasicCallgraphBuilder(CallgraphBuilder):
         for func in api.functions.values():
             caller = Caller(id=func.id)
 
-            src = clearSrc(func.src)
-
-            try:
-                astree = parse(src)
-            except Exception:
-                self.logger.error(
-                    f"Failed to parse code from {func.id}:\n{src}", exc_info=True
-                )
+            parsed = self.astCache.parse(func)
+            if parsed is None:
                 result.add(caller)
                 continue
+            src, astree = parsed
 
             self.logger.debug(f"Visit AST of {func.id}")
 
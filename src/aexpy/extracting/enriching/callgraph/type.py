@@ -1,4 +1,5 @@
 import logging
+import multiprocessing
 
 import mypy
 from mypy.nodes import (ARG_STAR2, CallExpr, ComplexExpr, Decorator, DictExpr,
@@ -90,12 +91,13 @@ class CallsiteGetter(TraverserVisitor):
         self.logger = logger
 
     def visit_call_expr(self, /, o: CallExpr) -> None:
-        site = Callsite(value=o)
-        site.targetValue = o.callee
+        site = Callsite()
 
         for i, a in enumerate(o.args):
             argu = Argument(
-                value=a, name=o.arg_names[i] or "", iskwargs=o.arg_kinds[i] == ARG_STAR2
+                ref=a.name if isinstance(a, NameExpr) else "",
+                name=o.arg_names[i] or "",
+                iskwargs=o.arg_kinds[i] == ARG_STAR2,
             )
             site.arguments.append(argu)
 
@@ -145,51 +147,107 @@ class CallsiteGetter(TraverserVisitor):
         super().visit_call_expr(o)
 
 
+_forked: "tuple[TypeCallgraphBuilder, ApiDescription, FunctionResolver] | None" = None
+"""Builder state inherited by forked workers."""
+
+
+def _visitChunk(ids: list[str]):
+    assert _forked is not None
+    builder, api, resolver = _forked
+    result = []
+    for id in ids:
+        caller = builder.visit(api, api.functions[id], resolver)
+        if caller is not None:
+            result.append(caller)
+    return result
+
+
 class TypeCallgraphBuilder(CallgraphBuilder):
     def __init__(
-        self, /, server: PackageMypyServer, logger: logging.Logger | None = None
+        self,
+        /,
+        server: PackageMypyServer,
+        logger: logging.Logger | None = None,
+        workers: int = 1,
     ) -> None:
         super().__init__()
         self.server = server
+        self.workers = workers
+        """Count of forked processes visiting functions, 1 to visit in process."""
         self.logger = (
             logger.getChild("callgraph-type")
             if logger is not None
             else logging.getLogger("callgraph-type")
         )
 
+    def visit(
+        self, /, api: ApiDescription, func: FunctionEntry, resolver: FunctionResolver
+    ):
+        caller = Caller(id=func.id)
+
+        element = self.server.element(func)
+
+        if element is None:
+            self.logger.error(f"Failed to load element {func.id} @ {func.location}.")
+            return None
+
+        symbolNode = element[0]
+        node = symbolNode.node
+
+        if isinstance(node, Decorator):
+            self.logger.debug(f"Detect decorators for {func.id}, use inner function.")
+            node = node.func
+
+        if not isinstance(node, FuncDef):
+            self.logger.error(f"Node {type(node)} is not a function definition.")
+            return None
+
+        self.logger.debug(f"Visit AST of {func.id}")
+
+        getter = CallsiteGetter(api, caller, resolver, self.logger)
+        getter.accept(node)
+
+        return caller
+
     def build(self, /, api: ApiDescription) -> Callgraph:
         result = Callgraph()
         resolver = FunctionResolver(api)
 
-        for func in api.functions.values():
-            caller = Caller(id=func.id)
+        if self.workers > 1:
+            if "fork" in multiprocessing.get_all_start_methods():
+                for caller in self.buildParallel(api, resolver):
+                    result.add(caller)
+                return result
+            self.logger.warning("Fork is not supported, visit functions in process.")
 
-            element = self.server.element(func)
+        for func in api.functions.values():
+            caller = self.visit(api, func, resolver)
+            if caller is not None:
+                result.add(caller)
 
-            if element is None:
-                self.logger.error(
-                    f"Failed to load element {func.id} @ {func.location}."
-                )
-                continue
+        return result
 
-            symbolNode = element[0]
-            node = symbolNode.node
+    def buildParallel(self, /, api: ApiDescription, resolver: FunctionResolver):
+        """Visit functions in forked workers sharing the prepared mypy graph.
 
-            if isinstance(node, Decorator):
-                self.logger.debug(
-                    f"Detect decorators for {func.id}, use inner function."
-                )
-                node = node.func
+        Callers are yielded in the order of api.functions."""
 
-            if not isinstance(node, FuncDef):
-                self.logger.error(f"Node {type(node)} is not a function definition.")
-                continue
+        global _forked
 
-            self.logger.debug(f"Visit AST of {func.id}")
+        assert self.server.proxy.prepared, "Mypy server must be prepared before fork."
 
-            getter = CallsiteGetter(api, caller, resolver, self.logger)
-            getter.accept(node)
+        ids = list(api.functions.keys())
+        size = max(1, min(256, len(ids) // (self.workers * 4) or 1))
+        chunks = [ids[i : i + size] for i in range(0, len(ids), size)]
 
-            result.add(caller)
+        self.logger.info(
+            f"Visit {len(ids)} functions in {len(chunks)} chunks by {self.workers} workers."
+        )
 
-        return result
+        _forked = self, api, resolver
+        try:
+            with multiprocessing.get_context("fork").Pool(self.workers) as pool:
+                for callers in pool.imap(_visitChunk, chunks):
+                    yield from callers
+        finally:
+            _forked = None
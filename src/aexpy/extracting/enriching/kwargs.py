@@ -1,27 +1,34 @@
 import ast
 import logging
 from ast import NodeVisitor
-
-from mypy.nodes import NameExpr
+from collections import deque
+from dataclasses import dataclass, field
 
 from ...models import ApiDescription
 from ...models.description import (FunctionEntry, FunctionFlag, ItemScope,
                                    Parameter, ParameterKind)
-from . import Enricher, callgraph, clearSrc
+from . import AstCache, Enricher, callgraph
 
 
 def _try_addkwc_parameter(
-    entry: "FunctionEntry", parameter: "Parameter", logger: "logging.Logger"
+    entry: "FunctionEntry",
+    parameter: "Parameter",
+    logger: "logging.Logger",
+    names: "set[str] | None" = None,
 ):
-    """Return if add successfully"""
+    """Return if add successfully
+
+    names is the set of parameter names of entry, kept in sync when given."""
     # logger.debug(f"Try add parameter {parameter.name} to {entry.id}({[p.name for p in entry.parameters]}).")
-    if (
-        len([x for x in entry.parameters if x.name == parameter.name]) != 0
-    ):  # has same name parameter
+    if names is None:
+        names = {x.name for x in entry.parameters}
+    if parameter.name in names:  # has same name parameter
         return False
+    names.add(parameter.name)
     entry.parameters.append(
         parameter.model_copy(update={"kind": ParameterKind.VarKeywordCandidate})
     )
+    entry.clearParameterCache()
     logger.debug(f"Detect candidate {entry.id}: {parameter.name}")
     return True
 
@@ -102,12 +109,14 @@ class KwargChangeGetter(NodeVisitor):
         self.logger = logger
         self.result = result
         self.kwargs = kwargs
+        self.names = {p.name for p in result.parameters}
 
     def add(self, /, name: "str"):
         _try_addkwc_parameter(
             self.result,
             Parameter(name=name, optional=True, source=self.result.id),
             self.logger,
+            self.names,
         )
 
     def visit_Call(self, /, node: "ast.Call"):
@@ -146,9 +155,72 @@ class KwargChangeGetter(NodeVisitor):
             )
 
 
+@dataclass
+class KwargsEdge:
+    """A call site passing the caller's **kwargs to the target."""
+
+    caller: str
+    target: str
+    ignoredPosition: set[int] = field(default_factory=set)
+    ignoredKeyword: set[str] = field(default_factory=set)
+    done: int = 0
+    """Count of target parameters already propagated."""
+    queued: bool = False
+
+
+def _sccs(graph: dict[str, list[str]]):
+    """Strongly connected components by Tarjan's algorithm, callees before callers."""
+
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    stack: list[str] = []
+    onStack: set[str] = set()
+    result: list[list[str]] = []
+
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        onStack.add(root)
+        work = [(root, iter(graph.get(root, [])))]
+        while work:
+            node, children = work[-1]
+            child = next(children, None)
+            if child is not None:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    onStack.add(child)
+                    work.append((child, iter(graph.get(child, []))))
+                elif child in onStack:
+                    low[node] = min(low[node], index[child])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    item = stack.pop()
+                    onStack.remove(item)
+                    component.append(item)
+                    if item == node:
+                        break
+                result.append(component)
+
+    return result
+
+
 class KwargsEnricher(Enricher):
     def __init__(
-        self, /, cg: callgraph.Callgraph, logger: logging.Logger | None = None
+        self,
+        /,
+        cg: callgraph.Callgraph,
+        logger: logging.Logger | None = None,
+        astCache: AstCache | None = None,
+        byCallgraph: bool = False,
     ) -> None:
         super().__init__()
         self.logger = (
@@ -157,116 +229,152 @@ class KwargsEnricher(Enricher):
             else logging.getLogger("kwargs-enrich")
         )
         self.cg = cg
+        self.astCache = astCache or AstCache(self.logger)
+        self.byCallgraph = byCallgraph
+        """Propagate candidates from callees receiving the caller's **kwargs."""
         self.kwargAlias = {}
 
     def enrich(self, /, api: ApiDescription):
         self.enrichByDictChange(api)
-        # self.enrichByCallgraph(api)
+        if self.byCallgraph:
+            self.enrichByCallgraph(api)
 
     def enrichByDictChange(self, /, api: ApiDescription):
         for func in api.functions.values():
             if func.varKeyword:
-                src = clearSrc(func.src)
-                try:
-                    astree = ast.parse(src)
-                except Exception:
-                    self.logger.error(
-                        f"Failed to parse code from {func.id}:\n{src}", exc_info=True
-                    )
+                parsed = self.astCache.parse(func)
+                if parsed is None:
                     continue
+                _, astree = parsed
                 alias = KwargAliasGetter(func, self.logger)
                 alias.visit(astree)
                 self.kwargAlias[func.id] = alias.alias
                 KwargChangeGetter(func, alias.alias, self.logger).visit(astree)
 
-    def enrichByCallgraph(self, /, api: ApiDescription):
-        cg = self.cg
+    def kwargsEdges(self, /, api: ApiDescription):
+        for caller in self.cg.items.values():
+            callerEntry = api.functions.get(caller.id)
 
-        cycle = 0
+            if callerEntry is None:
+                continue
 
-        changed = True
+            kwarg = callerEntry.varKeyword
 
-        while changed and cycle < 100:
-            changed = False
-            cycle += 1
+            if kwarg is None:
+                continue
 
-            self.logger.debug(f"Cycle {cycle} to enrich by callgraph.")
+            kwargNames = self.kwargAlias.get(callerEntry.id)
+            if kwargNames is None:
+                kwargNames = [kwarg.name]
 
-            for caller in cg.items.values():
-                callerEntry = api.functions[caller.id]
+            for site in caller.sites:
+                hasKwargsRef = False
+                ignoredPosition = set()
+                ignoredKeyword = set()
 
-                kwarg = callerEntry.varKeyword
+                for index, arg in enumerate(site.arguments):
+                    if arg.iskwargs:
+                        # has **kwargs argument
+                        if arg.ref in kwargNames:
+                            hasKwargsRef = True
+                            break
+                    else:
+                        if arg.name:
+                            ignoredKeyword.add(arg.name)
+                        else:
+                            ignoredPosition.add(index)
 
-                if kwarg is None:
+                if not hasKwargsRef:
                     continue
 
-                kwargNames = self.kwargAlias.get(callerEntry.id)
-                if kwargNames is None:
-                    kwargNames = [kwarg.name]
-
-                for site in caller.sites:
-                    hasKwargsRef = False
-                    ignoredPosition = set()
-                    ignoredKeyword = set()
-
-                    for index, arg in enumerate(site.arguments):
-                        if arg.iskwargs:
-                            match arg.value:
-                                # has **kwargs argument
-                                case ast.Name() as name if name.id in kwargNames:
-                                    hasKwargsRef = True
-                                    break
-                                case NameExpr() as mname if mname.name in kwargNames:
-                                    hasKwargsRef = True
-                                    break
-                        else:
-                            if arg.name:
-                                ignoredKeyword.add(arg.name)
-                            else:
-                                ignoredPosition.add(index)
+                callerEntry.flags |= FunctionFlag.TransmitKwargs
 
-                    if hasKwargsRef:
-                        callerEntry.flags |= FunctionFlag.TransmitKwargs
+                for target in site.targets:
+                    targetEntry = api[target]
 
-                    if not hasKwargsRef:
+                    if not isinstance(targetEntry, FunctionEntry):
                         continue
 
-                    for target in site.targets:
-                        targetEntry = api[target]
-
-                        if not isinstance(targetEntry, FunctionEntry):
-                            continue
-
-                        # ignore magic methods
-                        if (
-                            targetEntry.name.startswith("__")
-                            and targetEntry.name != "__init__"
-                        ):
-                            continue
-
-                        self.logger.debug(
-                            f"Enrich by call edge: {callerEntry.id}({[p.name for p in callerEntry.parameters]}) -> {targetEntry.id}({[p.name for p in targetEntry.parameters]})"
-                        )
-
-                        for index, arg in enumerate(
-                            targetEntry.parameters[
-                                (0 if targetEntry.scope == ItemScope.Static else 1) :
-                            ]
-                        ):
-                            if index in ignoredPosition:
-                                continue
-                            if arg.name in ignoredKeyword:
-                                continue
-                            if not arg.isKeyword:
-                                continue
-                            changed = (
-                                _try_addkwc_parameter(callerEntry, arg, self.logger)
-                                or changed
-                            )
-
-        if changed:
-            self.logger.warning(
-                f"Too many change cycles to enrich kwargs: {cycle} cycles"
-            )
-        else:
-            self.logger.debug(f"Kwargs enrichment finished in {cycle} cycles")
+                    # ignore magic methods
+                    if (
+                        targetEntry.name.startswith("__")
+                        and targetEntry.name != "__init__"
+                    ):
+                        continue
+
+                    yield KwargsEdge(
+                        caller=callerEntry.id,
+                        target=targetEntry.id,
+                        ignoredPosition=ignoredPosition,
+                        ignoredKeyword=ignoredKeyword,
+                    )
+
+    def enrichByCallgraph(self, /, api: ApiDescription):
+        """Propagate parameters along **kwargs call edges until a fixpoint.
+
+        Edges are visited callees first by strongly connected components, and
+        an edge is revisited only when its target gains parameters, so each
+        target parameter is propagated once per edge."""
+
+        graph: dict[str, list[str]] = {}
+        outgoing: dict[str, list[KwargsEdge]] = {}
+        incoming: dict[str, list[KwargsEdge]] = {}
+
+        for edge in self.kwargsEdges(api):
+            graph.setdefault(edge.caller, []).append(edge.target)
+            outgoing.setdefault(edge.caller, []).append(edge)
+            incoming.setdefault(edge.target, []).append(edge)
+
+        worklist: deque[KwargsEdge] = deque()
+        for component in _sccs(graph):
+            for caller in component:
+                for edge in outgoing.get(caller, []):
+                    edge.queued = True
+                    worklist.append(edge)
+
+        names: dict[str, set[str]] = {}
+
+        def parameterNames(entry: FunctionEntry):
+            if entry.id not in names:
+                names[entry.id] = {p.name for p in entry.parameters}
+            return names[entry.id]
+
+        steps = 0
+
+        while worklist:
+            edge = worklist.popleft()
+            edge.queued = False
+            steps += 1
+
+            callerEntry = api.functions[edge.caller]
+            targetEntry = api.functions[edge.target]
+            callerNames = parameterNames(callerEntry)
+
+            parameters = targetEntry.parameters[
+                (0 if targetEntry.scope == ItemScope.Static else 1) :
+            ]
+
+            changed = False
+            for index in range(edge.done, len(parameters)):
+                arg = parameters[index]
+                if index in edge.ignoredPosition:
+                    continue
+                if arg.name in edge.ignoredKeyword:
+                    continue
+                if not arg.isKeyword:
+                    continue
+                changed = (
+                    _try_addkwc_parameter(callerEntry, arg, self.logger, callerNames)
+                    or changed
+                )
+            edge.done = len(parameters)
+
+            if changed:
+                for dependent in incoming.get(edge.caller, []):
+                    if not dependent.queued:
+                        dependent.queued = True
+                        worklist.append(dependent)
+
+        self.logger.debug(
+            f"Kwargs enrichment finished: {sum(len(v) for v in outgoing.values())} edges, {steps} steps."
+        )
@@ -1,29 +1,41 @@
-from typing import override
+from logging import Logger
+from typing import Callable, override
 
-from ..models import ApiDescription
+from ..models import ApiDescription, Distribution
 from ..models.description import FunctionEntry
+from .enriching import AstCache
 from .enriching.callgraph import Callgraph
-from .third.mypyserver import MypyExtractor
+from .third.mypyserver import MypyExtractor, PackageMypyServer
 
 
 class KwargsExtractor(MypyExtractor):
-    def enrichCallgraph(self, /, product: ApiDescription, cg: Callgraph):
-        callees: dict[str, set[str]] = {}
-
-        for caller in cg.items.values():
-            cur = set()
-            for site in caller.sites:
-                for target in site.targets:
-                    cur.add(target)
-            callees[caller.id] = cur
+    def __init__(
+        self,
+        /,
+        logger: Logger | None = None,
+        serverProvider: (
+            Callable[[Distribution], PackageMypyServer | None] | None
+        ) = None,
+        astCache: AstCache | None = None,
+        byCallgraph: bool = False,
+        callgraphWorkers: int = 1,
+    ):
+        super().__init__(
+            logger=logger, serverProvider=serverProvider, astCache=astCache
+        )
+        self.byCallgraph = byCallgraph
+        """Propagate kwargs candidates along the callgraph."""
+        self.callgraphWorkers = callgraphWorkers
+        """Count of processes building the callgraph."""
 
-        for key, value in callees.items():
-            entry = product[key]
+    def enrichCallgraph(self, /, product: ApiDescription, cg: Callgraph):
+        for id in cg.items:
+            entry = product[id]
             if not isinstance(entry, FunctionEntry):
                 continue
-            entry.callees = list(value)
+            entry.callees = cg.callees(id)
 
-        product.calcCallers()
+        product.calcCallers(cg.callers())
 
     @override
     def process(self, /, server, product, dist):
@@ -32,9 +44,13 @@ class KwargsExtractor(MypyExtractor):
         product.clearCache()
         from .enriching.callgraph.type import TypeCallgraphBuilder
 
-        cg = TypeCallgraphBuilder(server, self.logger).build(product)
+        cg = TypeCallgraphBuilder(
+            server, self.logger, workers=self.callgraphWorkers
+        ).build(product)
         self.enrichCallgraph(product, cg)
-        kwargs.KwargsEnricher(cg, self.logger).enrich(product)
+        kwargs.KwargsEnricher(
+            cg, self.logger, self.astCache, byCallgraph=self.byCallgraph
+        ).enrich(product)
 
         product.clearCache()
 
@@ -45,7 +61,7 @@ class KwargsExtractor(MypyExtractor):
         product.clearCache()
         from .enriching.callgraph.basic import BasicCallgraphBuilder
 
-        cg = BasicCallgraphBuilder(self.logger).build(product)
+        cg = BasicCallgraphBuilder(self.logger, self.astCache).build(product)
         self.enrichCallgraph(product, cg)
-        kwargs.KwargsEnricher(Callgraph(), self.logger).enrich(product)
+        kwargs.KwargsEnricher(Callgraph(), self.logger, self.astCache).enrich(product)
         product.clearCache()
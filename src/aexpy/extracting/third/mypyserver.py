@@ -27,6 +27,7 @@ from ...models import ApiDescription, Distribution
 from ...models.description import (ApiEntry, AttributeEntry, ClassEntry,
                                    FunctionEntry, ModuleEntry)
 from .. import Extractor
+from ..enriching import AstCache
 
 
 class MypyServer:
@@ -149,6 +150,7 @@ class PackageMypyServer:
         self.cacheFile = {}
         self.cacheMembers = {}
         self.cacheElement = {}
+        self.cacheLocals = {}
         self.proxy.prepare()
 
     def file(self, /, entry: ApiEntry) -> State | None:
@@ -159,6 +161,17 @@ class PackageMypyServer:
             )
         return self.cacheFile[entry.location.file]
 
+    def locals(
+        self, /, entry: ApiEntry
+    ) -> dict[str, tuple[SymbolTableNode, TypeInfo | None]]:
+        assert entry.location
+        if entry.location.file not in self.cacheLocals:
+            mod = self.file(entry)
+            self.cacheLocals[entry.location.file] = (
+                self.proxy.locals(mod) if mod else {}
+            )
+        return self.cacheLocals[entry.location.file]
+
     def members(self, /, entry: ClassEntry) -> dict[str, SymbolTableNode]:
         if entry.id not in self.cacheMembers:
             mod = self.file(entry)
@@ -166,7 +179,7 @@ class PackageMypyServer:
             result = {}
 
             if mod:
-                for node, info in self.proxy.locals(mod).values():
+                for node, info in self.locals(entry).values():
                     if info is None:
                         continue
                     if node.fullname is None:
@@ -196,7 +209,7 @@ class PackageMypyServer:
             if isinstance(entry, ModuleEntry):
                 result = mod
             elif mod:
-                result = self.proxy.locals(mod).get(entry.id)
+                result = self.locals(entry).get(entry.id)
             self.cacheElement[entry.id] = result
         return self.cacheElement[entry.id]
 
@@ -209,9 +222,11 @@ class MypyExtractor(Extractor):
         serverProvider: (
             Callable[[Distribution], PackageMypyServer | None] | None
         ) = None,
+        astCache: AstCache | None = None,
     ):
         super().__init__(logger=logger)
         self.serverProvider = serverProvider or self.defaultProvider
+        self.astCache = astCache or AstCache(self.logger)
 
     def defaultProvider(self, /, dist: Distribution):
         try:
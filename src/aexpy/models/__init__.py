@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from enum import IntEnum, unique
 from functools import cached_property
+from hashlib import blake2b
 from pathlib import Path
 from typing import override
 
@@ -9,7 +10,8 @@ from pydantic import BaseModel, ConfigDict, Field
 
 from .description import (ApiEntry, ApiEntryType, AttributeEntry, ClassEntry,
                           CollectionEntry, FunctionEntry, ItemScope,
-                          ModuleEntry, Parameter, SpecialEntry)
+                          ModuleEntry, Parameter, SpecialEntry,
+                          entryFingerprint)
 from .difference import BreakingRank, DiffEntry
 
 
@@ -146,6 +148,11 @@ class ApiDescription(SingleProduct):
     attributes: dict[str, AttributeEntry] = {}
     specials: dict[str, SpecialEntry] = {}
 
+    digest: str = ""
+    """Canonical digest of all entries, empty if not calculated."""
+    digests: dict[str, str] = {}
+    """Merkle digests of the subtrees of modules and classes, by their ids."""
+
     def __contains__(self, /, id: str):
         return (
             id in self.modules
@@ -197,17 +204,51 @@ class ApiDescription(SingleProduct):
         assert self.distribution is not None
         return self.distribution.single()
 
+    @cached_property
+    def resolvedEntries(self, /) -> dict[str, ApiEntryType | None]:
+        """Results of resolve by qualified names."""
+        return {}
+
+    @cached_property
+    def effectiveMembers(self, /) -> dict[str, dict[str, ApiEntryType | None]]:
+        """Members of classes resolved along their MROs, filled lazily by resolveMember."""
+        return {}
+
+    @cached_property
+    def entryChildren(self, /) -> dict[str, list[str]]:
+        """Ids of entries owned by each entry by parent links, roots under the empty id."""
+        result: dict[str, list[str]] = {}
+        for entry in self:
+            parent = entry.parent
+            if not parent or parent == entry.id or parent not in self:
+                parent = ""
+            result.setdefault(parent, []).append(entry.id)
+        return result
+
+    @override
+    def clearCache(self, /):
+        super().clearCache()
+        self.resolvedEntries.clear()
+        self.effectiveMembers.clear()
+        self.__dict__.pop("entryChildren", None)
+
     def resolve(self, /, qualName: str):
+        """Resolve the entry by the qualified name, results are cached until clearCache."""
+
+        resolved = self.resolvedEntries
+        if qualName in resolved:
+            return resolved[qualName]
+        result = None
         if qualName in self:
-            return self[qualName]
-        if "." not in qualName:
-            return None
-        parentName, memberName = qualName.rsplit(".", 1)
-        if parentName and memberName:
-            parent = self.resolve(parentName)
-            if isinstance(parent, CollectionEntry):
-                return self.resolveMember(parent, memberName)
-        return None
+            result = self[qualName]
+        elif "." in qualName:
+            parentName, memberName = qualName.rsplit(".", 1)
+            if parentName and memberName:
+                parent = self.resolve(parentName)
+                if isinstance(parent, CollectionEntry):
+                    result = self.resolveMember(parent, memberName)
+        resolved[qualName] = result
+        return result
 
     def resolveMember(self, /, entry: CollectionEntry, member: str):
         if isinstance(entry, ModuleEntry):
@@ -215,6 +256,16 @@ class ApiDescription(SingleProduct):
             return self[target] if target and target in self else None
         assert isinstance(entry, ClassEntry), f"Unknown collection entry type: {entry}"
 
+        members = self.effectiveMembers.get(entry.id)
+        if members is None:
+            members = self.effectiveMembers[entry.id] = {}
+        if member not in members:
+            members[member] = self.walkMember(entry, member)
+        return members[member]
+
+    def walkMember(self, /, entry: ClassEntry, member: str):
+        """Resolve the member by walking the MRO without caches."""
+
         result = None
         for mro in entry.mros:
             if result:
@@ -238,6 +289,9 @@ class ApiDescription(SingleProduct):
     def add(self, /, entry: ApiEntryType):
         if entry.id in self:
             raise ValueError(f"Duplicate entry id {entry.id}")
+        self.resolvedEntries.clear()
+        self.effectiveMembers.clear()
+        self.__dict__.pop("entryChildren", None)
         if isinstance(entry, ModuleEntry):
             self.modules[entry.id] = entry
         elif isinstance(entry, ClassEntry):
@@ -251,20 +305,29 @@ class ApiDescription(SingleProduct):
         else:
             raise Exception(f"Unknown entry type: {entry.__class__} of {entry}")
 
-    def calcCallers(self, /):
+    def calcCallers(self, /, edges: dict[str, list[str]] | None = None):
+        """Fill callers of functions, from the callee-to-callers edges if given, otherwise from callees."""
+
         callers: dict[str, set[str]] = {}
 
-        for item in self.functions.values():
-            for callee in item.callees:
-                if callee not in self:
-                    continue
-                if callee not in callers:
-                    callers[callee] = set()
-                callers[callee].add(item.id)
+        if edges is not None:
+            for callee, items in edges.items():
+                if callee in self:
+                    callers[callee] = {
+                        item for item in items if item in self.functions
+                    }
+        else:
+            for item in self.functions.values():
+                for callee in item.callees:
+                    if callee not in self:
+                        continue
+                    if callee not in callers:
+                        callers[callee] = set()
+                    callers[callee].add(item.id)
 
         for callee, caller in callers.items():
             entry = self[callee]
-            if isinstance(entry, FunctionEntry):
+            if isinstance(entry, FunctionEntry) and caller:
                 entry.callers = list(caller)
 
     def calcSubclasses(self, /):
@@ -316,6 +379,42 @@ class ApiDescription(SingleProduct):
         for entry in self:
             entry.alias = list(resolve(entry) - {entry.id})
 
+    def calcDigests(self, /):
+        """Calculate the canonical digest of entries and the Merkle digests of subtrees.
+
+        Entries are hashed by their diff-relevant fields in id order, so producer data,
+        locations, docs and entry orders do not matter.
+        The digest of an entry combines its own hash and the digests of the entries it owns,
+        so equal digests of a module mean the whole module tree is the same to diffing."""
+
+        fingerprints = {entry.id: entryFingerprint(entry) for entry in self}
+
+        hasher = blake2b(digest_size=16)
+        for id in sorted(fingerprints):
+            hasher.update(f"{id} {fingerprints[id]}\n".encode())
+        self.digest = hasher.hexdigest()
+
+        children = self.entryChildren
+        digests: dict[str, str] = {}
+        stack = [(id, False) for id in children.get("", [])]
+        while stack:
+            id, visited = stack.pop()
+            owned = children.get(id, [])
+            if not visited:
+                stack.append((id, True))
+                stack.extend((child, False) for child in owned)
+                continue
+            hasher = blake2b(fingerprints[id].encode(), digest_size=16)
+            for child in sorted(owned):
+                hasher.update(f"{child} {digests[child]}\n".encode())
+            digests[id] = hasher.hexdigest()
+
+        self.digests = {
+            id: digest
+            for id, digest in digests.items()
+            if isinstance(self[id], CollectionEntry)
+        }
+
     def name(self, /, name: str):
         return (item for item in self if item.name == name)
 
@@ -355,17 +454,38 @@ class ApiDifference(PairProduct):
         assert self.old and self.new
         return ReleasePair(old=self.old.single(), new=self.new.single())
 
+    @cached_property
+    def entryGroups(
+        self, /
+    ) -> tuple[dict[BreakingRank, list[DiffEntry]], dict[str, list[DiffEntry]]]:
+        """Entries grouped by ranks and by kinds in one pass, in the order of entries.
+
+        Call clearCache after changing entries or their ranks and kinds."""
+
+        ranks: dict[BreakingRank, list[DiffEntry]] = {}
+        kinds: dict[str, list[DiffEntry]] = {}
+        for entry in self.entries.values():
+            ranks.setdefault(entry.rank, []).append(entry)
+            kinds.setdefault(entry.kind, []).append(entry)
+        return ranks, kinds
+
+    @override
+    def clearCache(self, /):
+        super().clearCache()
+        self.__dict__.pop("entryGroups", None)
+
     def kind(self, /, name: str):
-        return [x for x in self.entries.values() if x.kind == name]
+        return list(self.entryGroups[1].get(name, ()))
 
     def kinds(self, /):
-        return list({x.kind for x in self.entries.values()})
+        return list(self.entryGroups[1])
 
     def evaluate(self, /):
+        ranks = self.entryGroups[0]
         changesCount: "dict[BreakingRank, int]" = {}
         level = None
         for item in reversed(BreakingRank):
-            items = self.rank(item)
+            items = ranks.get(item)
             if items:
                 if not level:
                     level = item
@@ -374,9 +494,21 @@ class ApiDifference(PairProduct):
         return level, changesCount
 
     def rank(self, /, rank: BreakingRank):
-        return [x for x in self.entries.values() if x.rank == rank]
+        return list(self.entryGroups[0].get(rank, ()))
 
     def breaking(self, /, rank: BreakingRank):
+        """Entries with the rank or higher ranks, in the order of entries.
+
+        The cached rank groups skip the scan when none or all of the entries match."""
+
+        ranks = self.entryGroups[0]
+        selected = [item for item in ranks if item >= rank]
+        if not selected:
+            return []
+        if len(selected) == 1:
+            return list(ranks[selected[0]])
+        if len(selected) == len(ranks):
+            return list(self.entries.values())
         return [x for x in self.entries.values() if x.rank >= rank]
 
 
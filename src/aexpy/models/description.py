@@ -1,6 +1,10 @@
+import functools
+import json
 from enum import IntEnum, IntFlag, unique
 from functools import cached_property
-from typing import Annotated, Any, Literal
+from hashlib import blake2b
+from types import UnionType
+from typing import Annotated, Any, Literal, Union, get_args, get_origin
 
 from pydantic import BaseModel, Field
 
@@ -33,6 +37,56 @@ class ApiEntry(BaseModel):
     data: dict[str, Any] = {}
 
 
+STRUCTURE_IGNORED_FIELDS = {
+    "alias",
+    "docs",
+    "comments",
+    "src",
+    "location",
+    "data",
+    "subclasses",
+    "callers",
+    "callees",
+}
+"""Entry fields that no constraint compares, volatile across extractions of the same code."""
+
+
+@functools.cache
+def setFields(cls: type[BaseModel]) -> frozenset[str]:
+    """Names of set-valued fields of the model class."""
+
+    result = set()
+    for name, field in cls.model_fields.items():
+        annotation = field.annotation
+        types = (
+            get_args(annotation)
+            if get_origin(annotation) in (Union, UnionType)
+            else (annotation,)
+        )
+        if any(get_origin(item) in (set, frozenset) for item in types):
+            result.add(name)
+    return frozenset(result)
+
+
+def entryFingerprint(entry: ApiEntry) -> str:
+    """Hash of the diff-relevant fields of the entry, e.g. members, bases, mros, parameters, types, flags and scope.
+
+    Fields in STRUCTURE_IGNORED_FIELDS are left out and set-valued fields are sorted,
+    so extracting the same code twice gives the same fingerprints."""
+
+    sets = setFields(type(entry))
+    hasher = blake2b(
+        entry.model_dump_json(exclude=STRUCTURE_IGNORED_FIELDS | sets).encode(),
+        digest_size=16,
+    )
+    for name in sorted(sets):
+        value = getattr(entry, name)
+        hasher.update(
+            f"\n{name} {json.dumps(sorted(value) if value is not None else None)}".encode()
+        )
+    return hasher.hexdigest()
+
+
 class CollectionEntry(ApiEntry):
     members: dict[str, str] = {}
     slots: set[str] | None = None
@@ -161,15 +215,33 @@ class FunctionEntry(ItemEntry):
     flags: FunctionFlag = FunctionFlag.Empty
 
     def getParameter(self, /, name: str):
-        for p in self.parameters:
-            if p.name == name:
-                return p
+        return self.parameterMap.get(name)
 
     def position(self, /, parameter: Parameter):
-        try:
-            return self.positionals.index(parameter)
-        except:
+        index = self.positionMap.get(parameter.name)
+        if index is None or self.positionals[index] != parameter:
             return None
+        return index
+
+    def clearParameterCache(self, /):
+        """Drop the cached parameter views after changing parameters."""
+
+        for name in PARAMETER_VIEWS:
+            self.__dict__.pop(name, None)
+
+    @cached_property
+    def parameterMap(self, /):
+        result: dict[str, Parameter] = {}
+        for x in self.parameters:
+            result.setdefault(x.name, x)
+        return result
+
+    @cached_property
+    def positionMap(self, /):
+        result: dict[str, int] = {}
+        for i, x in enumerate(self.positionals):
+            result.setdefault(x.name, i)
+        return result
 
     @cached_property
     def positionalOnlys(self, /):
@@ -208,6 +280,14 @@ class FunctionEntry(ItemEntry):
         return None
 
 
+PARAMETER_VIEWS = [
+    name
+    for name, value in vars(FunctionEntry).items()
+    if isinstance(value, cached_property)
+]
+"""Names of the cached views on FunctionEntry derived from parameters."""
+
+
 type ApiEntryType = ModuleEntry | ClassEntry | FunctionEntry | AttributeEntry | SpecialEntry
 
 
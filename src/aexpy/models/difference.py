@@ -23,3 +23,14 @@ class DiffEntry(BaseModel):
     data: dict[str, Any] = {}
     old: Annotated[ApiEntryType, Field(discriminator="form")] | None = None
     new: Annotated[ApiEntryType, Field(discriminator="form")] | None = None
+
+
+class DiffIndex(BaseModel):
+    """Per-entry content fingerprints of the API descriptions a difference comes from."""
+
+    old: dict[str, str] = {}
+    new: dict[str, str] = {}
+    entries: dict[str, dict[str, DiffEntry]] = {}
+    """Diff entries produced by constraints for each diffed entry id, keyed by their ids in the difference.
+
+    They are saved before evaluation and without old and new entries."""
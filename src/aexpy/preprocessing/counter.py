@@ -1,10 +1,94 @@
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from logging import Logger
+from pathlib import Path
 from typing import override
 
+from .. import utils
 from ..utils import topLevelModules
 from . import Preprocessor
 
+CHUNK_SIZE = 1 << 20
+
+OTHER_LINE_BREAKS = re.compile(rb"[\r\x0b\x0c\x1c-\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+"""UTF-8 encoded line breaks of str.splitlines other than \\n."""
+
+
+def countLines(path: str) -> int:
+    """Count lines as str.splitlines does, the last line may have no newline.
+
+    Newlines are counted over raw bytes in chunks, files with other line breaks,
+    e.g. \\r or \\x0c, are decoded and split instead."""
+
+    result = 0
+    last = b""
+    with open(path, "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            if OTHER_LINE_BREAKS.search(last[-2:] + chunk):
+                return len(Path(path).read_text().splitlines())
+            result += chunk.count(b"\n")
+            last = chunk
+    if last and not last.endswith(b"\n"):
+        result += 1
+    return result
+
+
+def scanFiles(path: str, suffix: str = ".py"):
+    """Yield (path, stat) of files with the suffix under the directory, by os.scandir."""
+
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(suffix) and entry.is_file():
+                        yield entry.path, entry.stat()
+        except OSError:
+            continue
+
 
 class FileCounterPreprocessor(Preprocessor):
+    def __init__(
+        self,
+        /,
+        logger: Logger | None = None,
+        workers: int | None = None,
+        cacheDir: Path | None = None,
+    ):
+        super().__init__(logger)
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        """Count of threads reading files."""
+        self.cacheDir = cacheDir
+        """Cache directory of the pipeline for line counts by (path, mtime, size), None to disable."""
+
+    def cacheFile(self, /, root: Path):
+        if self.cacheDir is None:
+            return None
+        key = hashlib.sha1(str(root.resolve()).encode()).hexdigest()[:16]
+        return self.cacheDir / "counter" / f"{key}.json"
+
+    def loadCache(self, /, file: Path | None) -> dict[str, list[int]]:
+        if file is None:
+            return {}
+        try:
+            return json.loads(file.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def saveCache(self, /, file: Path, data: dict[str, list[int]]):
+        try:
+            utils.ensureDirectory(file.parent)
+            temp = file.with_suffix(f".{os.getpid()}.tmp")
+            temp.write_text(json.dumps(data, separators=(",", ":")))
+            os.replace(temp, file)
+        except OSError:
+            self.logger.warning(f"Failed to save line counts to {file}.", exc_info=True)
+
     @override
     def preprocess(self, /, product):
         assert product.rootPath, "No root path provided."
@@ -16,12 +100,40 @@ class FileCounterPreprocessor(Preprocessor):
         product.fileSize = 0
         product.locCount = 0
 
+        cacheFile = self.cacheFile(product.rootPath)
+        cached = self.loadCache(cacheFile)
+        counts: dict[str, list[int]] = {}
+        pending: list[str] = []
+
         for src in product.src:
-            pyfiles = list(src.glob("**/*.py"))
-            product.fileCount += len(pyfiles)
-            for item in pyfiles:
-                try:
-                    product.fileSize += item.stat().st_size
-                    product.locCount += len(item.read_text().splitlines())
-                except Exception:
-                    self.logger.error(f"Failed to stat file {item}.", exc_info=True)
+            for path, stat in scanFiles(str(src)):
+                product.fileCount += 1
+                product.fileSize += stat.st_size
+                item = cached.get(path)
+                if item is not None and item[:2] == [stat.st_mtime_ns, stat.st_size]:
+                    product.locCount += item[2]
+                    counts[path] = item
+                else:
+                    counts[path] = [stat.st_mtime_ns, stat.st_size, 0]
+                    pending.append(path)
+
+        def count(path: str):
+            try:
+                return countLines(path)
+            except Exception:
+                self.logger.error(f"Failed to count lines of {path}.", exc_info=True)
+                return None
+
+        self.logger.debug(
+            f"Count lines of {len(pending)} files, {len(counts) - len(pending)} cached."
+        )
+        with ThreadPoolExecutor(self.workers) as executor:
+            for path, lines in zip(pending, executor.map(count, pending)):
+                if lines is None:
+                    counts.pop(path)
+                else:
+                    counts[path][2] = lines
+                    product.locCount += lines
+
+        if cacheFile and (pending or counts.keys() != cached.keys()):
+            self.saveCache(cacheFile, counts)
@@ -1,9 +1,7 @@
-import hashlib
 import logging
 import os
 import platform
 import subprocess
-import urllib.request
 from dataclasses import dataclass, field
 from logging import Logger
 from pathlib import Path
@@ -15,9 +13,10 @@ from pip import __version__
 from .. import getCacheDirectory, utils
 from ..models import Release
 from . import PYVERSION_LOWER, PYVERSION_UPPER, Preprocessor
-from .pypi import (FILE_ORIGIN, FILE_TSINGHUA, INDEX_ORIGIN, INDEX_TSINGHUA,
-                   getReleases)
-from .wheel import CompatibilityTag
+from .fetch import Download, getPool
+from .pypi import (API_ORIGIN, FILE_ORIGIN, FILE_TSINGHUA, INDEX_ORIGIN,
+                   INDEX_TSINGHUA, getReleases)
+from .wheel import CompatibilityTag, supportsPython
 
 PYVERSIONS = [f"3.{i}" for i in range(PYVERSION_UPPER, PYVERSION_LOWER - 1, -1)]
 
@@ -163,13 +162,17 @@ class DownloadInfo:
 
 
 def wheelByHttp(
-    release: Release, path: Path, logger: Logger | None, mirror: bool = False
+    release: Release,
+    path: Path,
+    logger: Logger | None,
+    mirror: bool = False,
+    api: str = API_ORIGIN,
 ) -> Path:
     logger = logger or logging.getLogger("pre-download-http")
 
-    rels = getReleases(release.project)
+    rels = getReleases(release.project, api)
     if rels is None or release.version not in rels:
-        rels = getReleases(release.project)
+        rels = getReleases(release.project, api, refresh=True)
     if rels is None or release.version not in rels:
         raise Exception(f"Not found the release {release}")
     download = getDownloadInfo(rels[release.version])
@@ -178,6 +181,64 @@ def wheelByHttp(
     return downloadRawWheel(download, path, logger, mirror)
 
 
+def selectWheel(files: list[dict], pyversions: list[str]) -> tuple[dict, str] | None:
+    """Select the wheel for the first supported pyversion in one pass over the release files.
+
+    Yanked wheels and wheels whose Requires-Python excludes the pyversion are skipped.
+    The most specific tag is preferred among wheels of the same pyversion."""
+
+    wheels = []
+    for item in files:
+        if item["packagetype"] != "bdist_wheel" or item.get("yanked"):
+            continue
+        tag = CompatibilityTag.fromfile(item["filename"])
+        if tag is not None and tag.supportsPlatform():
+            wheels.append((item, tag))
+
+    for pyversion in pyversions:
+        candidates = [
+            (rank, index)
+            for index, (item, tag) in enumerate(wheels)
+            if (rank := tag.rank(pyversion)) is not None
+            and supportsPython(item.get("requires_python"), pyversion)
+        ]
+        if candidates:
+            return wheels[min(candidates)[1]][0], pyversion
+
+    return None
+
+
+def wheelBySelection(
+    release: Release,
+    path: Path,
+    pyversions: list[str] | None = None,
+    logger: Logger | None = None,
+    mirror: bool = False,
+    api: str = API_ORIGIN,
+) -> tuple[Path, str]:
+    """Download the compatible wheel selected from the release files by one request."""
+
+    logger = logger or logging.getLogger("pre-download-select")
+    pyversions = pyversions or PYVERSIONS
+
+    rels = getReleases(release.project, api)
+    if rels is None or release.version not in rels:
+        rels = getReleases(release.project, api, refresh=True)
+    if rels is None or release.version not in rels:
+        raise Exception(f"Not found the release {release}")
+
+    selected = selectWheel(rels[release.version], pyversions)
+    if selected is None:
+        raise Exception(f"Not found the compatible wheel for {release}")
+    item, pyversion = selected
+    logger.debug(f"Select wheel {item['filename']} for Python {pyversion}.")
+
+    info = DownloadInfo(
+        item["url"], item["digests"].get("sha256", ""), item["digests"].get("md5", "")
+    )
+    return downloadRawWheel(info, path, logger, mirror), pyversion
+
+
 def getDownloadInfo(
     release: list[dict], packagetype="bdist_wheel"
 ) -> DownloadInfo | None:
@@ -244,34 +305,44 @@ def getDownloadInfo(
 def downloadRawWheel(
     info: DownloadInfo, path: Path, logger: Logger, mirror: bool = False
 ) -> Path:
-    cacheFile = path / info.name
+    result = downloadRawWheels([info], path, logger, mirror)[0]
+    if isinstance(result, BaseException):
+        raise result
+    return result
 
-    if mirror:
-        url = info.url.replace(FILE_ORIGIN, FILE_TSINGHUA)
-    else:
-        url = info.url
 
-    if not cacheFile.exists():
-        logger.debug(f"Download wheel @ {url}.")
-        try:
-            req = urllib.request.Request(url)
-            with urllib.request.urlopen(req, timeout=60) as res:
-                content = res.read()
-            if info.sha256:
-                if hashlib.sha256(content).hexdigest() != info.sha256:
-                    raise Exception(f"Release download sha256 mismatch: {info}.")
+def downloadRawWheels(
+    infos: list[DownloadInfo], path: Path, logger: Logger, mirror: bool = False
+) -> list[Path | BaseException]:
+    """Download wheels concurrently over the shared connection pool.
+
+    Results are paths or exceptions in the order of infos, cached wheels are reused."""
 
-            if info.md5:
-                if hashlib.md5(content).hexdigest() != info.md5:
-                    raise Exception(f"Release download md5 mismatch: {info}.")
+    results: list[Path | BaseException] = []
+    pending: list[Download] = []
+    indices: list[int] = []
 
-            with open(cacheFile, "wb") as file:
-                file.write(content)
-        except Exception as ex:
-            logger.error(f"Not found wheel {url}.", exc_info=True)
-            raise Exception(f"Not found download: {url}.") from ex
+    for info in infos:
+        cacheFile = path / info.name
+        if cacheFile.exists():
+            results.append(cacheFile.resolve())
+            continue
+        url = info.url.replace(FILE_ORIGIN, FILE_TSINGHUA) if mirror else info.url
+        logger.debug(f"Download wheel @ {url}.")
+        indices.append(len(results))
+        results.append(cacheFile)
+        pending.append(Download(url, cacheFile, info.sha256, info.md5))
+
+    for index, item, result in zip(indices, pending, getPool().downloadAll(pending)):
+        if isinstance(result, BaseException):
+            logger.error(f"Not found wheel {item.url}.", exc_info=result)
+            exception = Exception(f"Not found download: {item.url}.")
+            exception.__cause__ = result
+            results[index] = exception
+        else:
+            results[index] = result.resolve()
 
-    return cacheFile.resolve()
+    return results
 
 
 class PipWheelDownloadPreprocessor(Preprocessor):
@@ -294,8 +365,21 @@ class PipWheelDownloadPreprocessor(Preprocessor):
             pyversions = [product.pyversion] + PYVERSIONS
         else:
             pyversions = None
-        wheelFile, pyversion = wheelByPip(
-            product.release, self.cacheDir, pyversions, logger=self.logger
-        )
+        try:
+            wheelFile, pyversion = wheelBySelection(
+                product.release,
+                self.cacheDir,
+                pyversions,
+                logger=self.logger,
+                mirror=self.mirror,
+            )
+        except Exception:
+            self.logger.warning(
+                f"Failed to select wheel for {product.release}, fallback to pip.",
+                exc_info=True,
+            )
+            wheelFile, pyversion = wheelByPip(
+                product.release, self.cacheDir, pyversions, logger=self.logger
+            )
         product.pyversion = pyversion
         product.wheelFile = wheelFile
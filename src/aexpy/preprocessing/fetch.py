@@ -0,0 +1,221 @@
+import hashlib
+import http.client
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from logging import Logger
+from pathlib import Path
+from typing import Iterator
+from urllib import parse
+
+CHUNK_SIZE = 1 << 16
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+REDIRECT_STATUS = {301, 302, 303, 307, 308}
+
+
+class FetchError(Exception):
+    def __init__(self, /, url: str, status: int = 0, reason: str = "") -> None:
+        detail = " ".join(str(item) for item in (status, reason) if item)
+        super().__init__(f"Failed to fetch {url}: {detail}.")
+        self.url = url
+        self.status = status
+
+    @property
+    def retryable(self, /):
+        return not self.status or self.status in RETRY_STATUS
+
+
+@dataclass
+class Download:
+    url: str
+    target: Path
+    sha256: str = ""
+    md5: str = ""
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections shared by threads, reused per host.
+
+    At most size requests are in flight at the same time, and failed requests
+    are retried with exponential backoff."""
+
+    def __init__(
+        self,
+        /,
+        size: int = 8,
+        timeout: float = 60,
+        retries: int = 3,
+        backoff: float = 0.5,
+        logger: Logger | None = None,
+    ) -> None:
+        self.size = size
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.logger = (
+            logger.getChild("fetch")
+            if logger is not None
+            else logging.getLogger("fetch")
+        )
+        self.idle: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(size)
+
+    def acquire(self, /, scheme: str, host: str) -> http.client.HTTPConnection:
+        with self.lock:
+            conns = self.idle.get((scheme, host))
+            if conns:
+                return conns.pop()
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, timeout=self.timeout)
+        if scheme == "http":
+            return http.client.HTTPConnection(host, timeout=self.timeout)
+        raise ValueError(f"Unsupported scheme {scheme}.")
+
+    def release(
+        self, /, scheme: str, host: str, conn: http.client.HTTPConnection
+    ) -> None:
+        with self.lock:
+            conns = self.idle.setdefault((scheme, host), [])
+            if len(conns) < self.size:
+                conns.append(conn)
+                return
+        conn.close()
+
+    def close(self, /) -> None:
+        with self.lock:
+            conns = [conn for items in self.idle.values() for conn in items]
+            self.idle.clear()
+        for conn in conns:
+            conn.close()
+
+    def send(
+        self, /, url: str, headers: dict[str, str] | None = None, redirects: int = 5
+    ) -> tuple[str, str, http.client.HTTPConnection, http.client.HTTPResponse]:
+        for attempt in range(self.retries + 1):
+            target = parse.urlsplit(url)
+            path = parse.urlunsplit(("", "", target.path or "/", target.query, ""))
+            conn = self.acquire(target.scheme, target.netloc)
+            try:
+                conn.request("GET", path, headers=headers or {})
+                res = conn.getresponse()
+            except (OSError, http.client.HTTPException) as ex:
+                conn.close()
+                if attempt >= self.retries:
+                    raise FetchError(url, reason=str(ex)) from ex
+                self.logger.warning(f"Retry {url} ({attempt + 1}): {ex}.")
+            else:
+                if res.status in REDIRECT_STATUS and redirects > 0:
+                    location = res.getheader("Location", "")
+                    res.read()
+                    self.release(target.scheme, target.netloc, conn)
+                    return self.send(
+                        parse.urljoin(url, location), headers, redirects - 1
+                    )
+                if res.status in RETRY_STATUS and attempt < self.retries:
+                    res.read()
+                    self.release(target.scheme, target.netloc, conn)
+                    self.logger.warning(f"Retry {url} ({attempt + 1}): {res.status}.")
+                else:
+                    return target.scheme, target.netloc, conn, res
+            time.sleep(self.backoff * 2**attempt)
+        raise FetchError(url)
+
+    @contextmanager
+    def open(
+        self, /, url: str, headers: dict[str, str] | None = None
+    ) -> Iterator[http.client.HTTPResponse]:
+        """Open a response, the connection is reused if the body is fully read."""
+
+        with self.slots:
+            scheme, host, conn, res = self.send(url, headers)
+            try:
+                yield res
+            finally:
+                if res.isclosed() and not res.will_close:
+                    self.release(scheme, host, conn)
+                else:
+                    conn.close()
+
+    def fetch(self, /, url: str, headers: dict[str, str] | None = None) -> bytes:
+        with self.open(url, headers) as res:
+            content = res.read()
+            if res.status != 200:
+                raise FetchError(url, res.status, res.reason)
+            return content
+
+    def download(self, /, item: Download) -> Path:
+        """Stream the body to a partial file in chunks, verifying hashes on the way.
+
+        The whole download is retried if the connection breaks or hashes mismatch."""
+
+        partial = item.target.with_name(item.target.name + ".part")
+        for attempt in range(self.retries + 1):
+            sha256, md5 = hashlib.sha256(), hashlib.md5()
+            try:
+                with self.open(item.url) as res:
+                    if res.status != 200:
+                        res.read()
+                        raise FetchError(item.url, res.status, res.reason)
+                    with open(partial, "wb") as file:
+                        while chunk := res.read(CHUNK_SIZE):
+                            sha256.update(chunk)
+                            md5.update(chunk)
+                            file.write(chunk)
+                if item.sha256 and sha256.hexdigest() != item.sha256:
+                    raise FetchError(item.url, reason="sha256 mismatch")
+                if item.md5 and md5.hexdigest() != item.md5:
+                    raise FetchError(item.url, reason="md5 mismatch")
+                os.replace(partial, item.target)
+                return item.target
+            except (OSError, http.client.HTTPException, FetchError) as ex:
+                partial.unlink(missing_ok=True)
+                if isinstance(ex, FetchError) and not ex.retryable:
+                    raise
+                if attempt >= self.retries:
+                    raise
+                self.logger.warning(f"Retry download {item.url} ({attempt + 1}): {ex}.")
+                time.sleep(self.backoff * 2**attempt)
+        raise FetchError(item.url)
+
+    def downloadAll(self, /, items: list[Download]) -> list[Path | BaseException]:
+        """Download items concurrently, results are paths or exceptions in order."""
+
+        def task(item: Download):
+            try:
+                return self.download(item)
+            except Exception as ex:
+                self.logger.error(f"Failed to download {item.url}.", exc_info=True)
+                return ex
+
+        if len(items) <= 1:
+            return [task(item) for item in items]
+        with ThreadPoolExecutor(min(self.size, len(items))) as executor:
+            return list(executor.map(task, items))
+
+
+_pool: ConnectionPool | None = None
+_poolLock = threading.Lock()
+
+
+def getPool() -> ConnectionPool:
+    """Return the connection pool shared in this process."""
+
+    global _pool
+    with _poolLock:
+        if _pool is None:
+            _pool = ConnectionPool()
+        return _pool
+
+
+def _resetPool():
+    global _pool
+    _pool = None
+
+
+# Forked workers must not share sockets with the parent.
+os.register_at_fork(after_in_child=_resetPool)
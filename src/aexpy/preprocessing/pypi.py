@@ -1,37 +1,228 @@
+import codecs
 import json
+import logging
+import os
 import re
-import urllib.request
+import tempfile
+import time
+from html.parser import HTMLParser
+from logging import Logger
+from pathlib import Path
+from typing import Any
+from urllib import parse
+
+from .. import getCacheDirectory, utils
+from .fetch import CHUNK_SIZE, FetchError, getPool
 
 FILE_ORIGIN = "https://files.pythonhosted.org/"
 FILE_TSINGHUA = "https://pypi.tuna.tsinghua.edu.cn/"
 INDEX_ORIGIN = "https://pypi.org/simple/"
 INDEX_TSINGHUA = "https://pypi.tuna.tsinghua.edu.cn/simple/"
+API_ORIGIN = "https://pypi.org/pypi/"
+
+MAX_AGE = 3600
+"""Seconds a cached metadata entry is used without revalidation."""
+
+CACHE_FORMAT = 2
+"""Format of cached metadata entries, entries of other formats are fetched again."""
+
+
+def normalizeName(project: str):
+    """Normalize a project name by PEP 503."""
+
+    return re.sub(r"[-_.]+", "-", project).lower()
+
+
+class SimpleIndexParser(HTMLParser):
+    """Collect project names from anchors of the simple index, fed chunk by chunk."""
+
+    def __init__(self, /) -> None:
+        super().__init__()
+        self.names: list[str] = []
+        self.anchor: list[str] | None = None
+
+    def handle_starttag(self, /, tag, attrs):
+        if tag == "a":
+            self.anchor = []
+
+    def handle_data(self, /, data):
+        if self.anchor is not None:
+            self.anchor.append(data)
+
+    def handle_endtag(self, /, tag):
+        if tag == "a" and self.anchor is not None:
+            self.names.append("".join(self.anchor).strip())
+            self.anchor = None
+
+
+class MetadataCache:
+    """On-disk cache of index metadata, revalidated by ETag and Last-Modified.
+
+    Each project is stored in one file, mapping versions to compact rows of
+    (filename, url, packagetype, sha256, md5, requires_python, yanked).
+    The root defaults to $AEXPY_PYPI_CACHE, or pypi in the cache directory."""
+
+    def __init__(
+        self,
+        /,
+        root: Path | None = None,
+        maxAge: float = MAX_AGE,
+        logger: Logger | None = None,
+    ) -> None:
+        self.root = root or Path(
+            os.getenv("AEXPY_PYPI_CACHE") or getCacheDirectory() / "pypi"
+        )
+        self.maxAge = maxAge
+        self.logger = (
+            logger.getChild("pypi-cache")
+            if logger is not None
+            else logging.getLogger("pypi-cache")
+        )
+
+    def location(self, /, source: str, name: str):
+        host = parse.urlsplit(source).netloc.replace(":", "_")
+        return self.root / host / f"{name}.json"
+
+    def read(self, /, file: Path) -> dict[str, Any] | None:
+        try:
+            data = json.loads(file.read_text())
+        except (OSError, ValueError):
+            return None
+        return data if data.get("format") == CACHE_FORMAT else None
+
+    def write(self, /, file: Path, data: dict[str, Any]):
+        """Write data atomically, failures are logged since the data is still usable."""
+
+        temp = None
+        try:
+            utils.ensureDirectory(file.parent)
+            fd, temp = tempfile.mkstemp(dir=file.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as stream:
+                json.dump(data, stream, separators=(",", ":"))
+            os.replace(temp, file)
+        except OSError:
+            self.logger.warning(f"Failed to cache metadata to {file}.", exc_info=True)
+            if temp is not None:
+                Path(temp).unlink(missing_ok=True)
+
+    def fresh(self, /, file: Path):
+        try:
+            return time.time() - file.stat().st_mtime < self.maxAge
+        except OSError:
+            return False
+
+    def validators(self, /, cached: dict[str, Any] | None):
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("modified"):
+                headers["If-Modified-Since"] = cached["modified"]
+        return headers
+
+    def revalidate(self, /, url: str, file: Path, load, refresh: bool = False):
+        """Return cached data of url, fetching it again only if it is stale and changed.
+
+        load receives the response and returns the data to cache."""
+
+        cached = self.read(file)
+        if cached is not None and not refresh and self.fresh(file):
+            return cached["data"]
+
+        with getPool().open(url, self.validators(cached)) as res:
+            if res.status == 304 and cached is not None:
+                res.read()
+                try:
+                    file.touch()
+                except OSError:
+                    pass
+                return cached["data"]
+            if res.status != 200:
+                res.read()
+                raise FetchError(url, res.status, res.reason)
+            data = load(res)
+            etag, modified = res.getheader("ETag"), res.getheader("Last-Modified")
+
+        self.write(
+            file,
+            {"format": CACHE_FORMAT, "etag": etag, "modified": modified, "data": data},
+        )
+        return data
+
+    def releases(self, /, project: str, api: str = API_ORIGIN, refresh: bool = False):
+        name = normalizeName(project)
+
+        def compact(res):
+            releases = json.loads(res.read())["releases"]
+            return {
+                version: [
+                    [
+                        item["filename"],
+                        item["url"],
+                        item["packagetype"],
+                        item["digests"].get("sha256", ""),
+                        item["digests"].get("md5", ""),
+                        item.get("requires_python") or "",
+                        bool(item.get("yanked")),
+                    ]
+                    for item in files
+                ]
+                for version, files in releases.items()
+            }
+
+        rows = self.revalidate(
+            f"{api}{name}/json", self.location(api, name), compact, refresh
+        )
+        return {
+            version: [
+                {
+                    "filename": filename,
+                    "url": url,
+                    "packagetype": packagetype,
+                    "digests": {"sha256": sha256, "md5": md5},
+                    "requires_python": requires,
+                    "yanked": yanked,
+                }
+                for filename, url, packagetype, sha256, md5, requires, yanked in files
+            ]
+            for version, files in rows.items()
+        }
+
+    def index(self, /, source: str, refresh: bool = False) -> list[str]:
+        def names(res):
+            parser = SimpleIndexParser()
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            while chunk := res.read(CHUNK_SIZE):
+                parser.feed(decoder.decode(chunk))
+            parser.feed(decoder.decode(b"", final=True))
+            parser.close()
+            return parser.names
 
+        return self.revalidate(source, self.location(source, "_index"), names, refresh)
 
-def getIndex(mirror: bool = False):
-    req = urllib.request.Request(INDEX_TSINGHUA if mirror else INDEX_ORIGIN)
-    with urllib.request.urlopen(req, timeout=60) as res:
-        htmlContent = res.read().decode("utf-8")
 
-    regex = r'<a href="[\w:/\.]*">([\S\s]*?)</a>'
-    return re.findall(regex, htmlContent)
+def getIndex(
+    mirror: bool = False, refresh: bool = False, cache: MetadataCache | None = None
+) -> list[str]:
+    return (cache or MetadataCache()).index(
+        INDEX_TSINGHUA if mirror else INDEX_ORIGIN, refresh
+    )
 
 
-def getReleases(project: str) -> dict | None:
+def getReleases(
+    project: str,
+    api: str = API_ORIGIN,
+    refresh: bool = False,
+    cache: MetadataCache | None = None,
+) -> dict | None:
     try:
-        req = urllib.request.Request(f"https://pypi.org/pypi/{project}/json")
-        with urllib.request.urlopen(req, timeout=60) as res:
-            text = res.read().decode("utf-8")
-        return json.loads(text)["release"]
-    except:
+        return (cache or MetadataCache()).releases(project, api, refresh)
+    except Exception:
         return None
 
 
-def getReleaseInfo(self, /, project: str, version: str) -> dict | None:
+def getReleaseInfo(project: str, version: str, api: str = API_ORIGIN) -> dict | None:
     try:
-        req = urllib.request.Request(f"https://pypi.org/pypi/{project}/{version}/json")
-        with urllib.request.urlopen(req, timeout=60) as res:
-            text = res.read().decode("utf-8")
-        return json.loads(text)["info"]
-    except:
+        return json.loads(getPool().fetch(f"{api}{project}/{version}/json"))["info"]
+    except Exception:
         return None
@@ -1,11 +1,19 @@
+import base64
+import csv
+import errno
+import hashlib
+import os
+import platform
+import re
 import shutil
+import tempfile
 import zipfile
 from dataclasses import dataclass, field
 from email.message import Message
 from email.parser import Parser
 from logging import Logger
 from pathlib import Path
-from typing import override
+from typing import Callable, override
 
 from .. import getCacheDirectory, utils
 from . import PYVERSION_LOWER, PYVERSION_UPPER, Preprocessor
@@ -35,6 +43,72 @@ class CompatibilityTag:
         except:
             return None
 
+    def supportsPlatform(self, /) -> bool:
+        if "any" in self.platform:
+            return True
+        if "windows" in platform.platform().lower():
+            return any(("win" in item and "amd64" in item for item in self.platform))
+        return any(("linux" in item and "x86_64" in item for item in self.platform))
+
+    def rank(self, /, pyversion: str) -> int | None:
+        """Rank of the tag for CPython pyversion, smaller is preferred, None if unsupported.
+
+        The platform is not considered, see supportsPlatform."""
+
+        minor = int(pyversion.split(".")[1])
+        result = None
+        for item in self.python.split("."):
+            if item == "py3":
+                rank = 3
+            elif item.startswith("cp3") and item[3:].isdigit():
+                if self.abi == "abi3":
+                    rank = 1 if int(item[3:]) <= minor else None
+                else:
+                    rank = 0 if int(item[3:]) == minor else None
+            elif item.startswith("py3") and item[3:].isdigit():
+                rank = 2 if int(item[3:]) <= minor else None
+            else:
+                rank = None
+            if rank is not None and (result is None or rank < result):
+                result = rank
+        return result
+
+
+def supportsPython(requires: str | None, pyversion: str) -> bool:
+    """Check if some release of CPython pyversion, e.g. 3.12, satisfies a Requires-Python specifier.
+
+    Clauses that are not understood, e.g. arbitrary equality, are satisfied."""
+
+    version = tuple(map(int, pyversion.split(".")[:2]))
+    for clause in (requires or "").split(","):
+        match = re.fullmatch(
+            r"\s*(~=|==|!=|<=|>=|<|>)\s*v?(\d+(?:\.\d+)*)(\.\*)?\s*", clause
+        )
+        if match is None:
+            continue
+        op, raw, wildcard = match.groups()
+        target = tuple(map(int, raw.split(".")))
+        minor = (target + (0, 0))[:2]
+        prefix = version[: len(target)] == target[: len(version)]
+        patched = any(target[2:])
+        if op == "==":
+            satisfied = prefix if wildcard else version == minor
+        elif op == "!=":
+            satisfied = not (wildcard and prefix)
+        elif op == "~=":
+            satisfied = version[: len(target) - 1] == target[:-1] and version >= minor
+        elif op == ">=":
+            satisfied = version >= minor
+        elif op == ">":
+            satisfied = version > minor or (version == minor and len(target) > 2)
+        elif op == "<=":
+            satisfied = version <= minor
+        else:
+            satisfied = version < minor or (version == minor and patched)
+        if not satisfied:
+            return False
+    return True
+
 
 @dataclass
 class DistInfo:
@@ -109,16 +183,147 @@ class DistInfo:
             return None
 
 
-def unpackWheel(wheelFile: Path, targetDir: Path):
+UNPACK_MARKER = ".aexpy-unpack"
+"""File in the unpacked directory recording the wheel digest and unpack mode."""
+
+
+def wheelRecord(file: zipfile.ZipFile) -> dict[str, str]:
+    """Map member names to sha256 hex digests listed in RECORD of the wheel."""
+
+    result = {}
+    for name in file.namelist():
+        if name.count("/") == 1 and name.endswith(".dist-info/RECORD"):
+            text = file.read(name).decode("utf-8")
+            for row in csv.reader(text.splitlines()):
+                if len(row) >= 2 and row[1].startswith("sha256="):
+                    digest = row[1].removeprefix("sha256=")
+                    digest += "=" * (-len(digest) % 4)
+                    result[row[0]] = base64.urlsafe_b64decode(digest).hex()
+    return result
+
+
+def wheelTopLevel(file: zipfile.ZipFile) -> list[str]:
+    for name in file.namelist():
+        if name.count("/") == 1 and name.endswith(".dist-info/top_level.txt"):
+            text = file.read(name).decode("utf-8")
+            return [s.strip() for s in text.splitlines() if s.strip()]
+    return []
+
+
+def sourceFilter(topModules: list[str]) -> Callable[[str], bool]:
+    """Select metadata and Python sources of top modules (all modules if empty)."""
+
+    tops = {item.replace(".", "/") for item in topModules}
+
+    def check(name: str):
+        parts = name.split("/")
+        if parts[0].endswith(".dist-info"):
+            return True
+        if not name.endswith((".py", ".pyi")) and parts[-1] != "py.typed":
+            return False
+        if parts[0].endswith(".data"):
+            return False
+        return not tops or any(
+            name.removesuffix(".pyi").removesuffix(".py") == top
+            or name.startswith(top + "/")
+            for top in tops
+        )
+
+    return check
+
+
+def memberDigest(file: zipfile.ZipFile, info: zipfile.ZipInfo) -> str:
+    """Return the sha256 hex digest of a member, read in chunks."""
+
+    hasher = hashlib.sha256()
+    with file.open(info) as source:
+        while chunk := source.read(1 << 16):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def storeMember(file: zipfile.ZipFile, info: zipfile.ZipInfo, store: Path) -> Path:
+    """Copy a member into the content-addressed store in chunks."""
+
+    utils.ensureDirectory(store)
+    hasher = hashlib.sha256()
+    fd, temp = tempfile.mkstemp(dir=store, suffix=".tmp")
+    with os.fdopen(fd, "wb") as target, file.open(info) as source:
+        while chunk := source.read(1 << 16):
+            hasher.update(chunk)
+            target.write(chunk)
+    digest = hasher.hexdigest()
+    result = store / digest[:2] / digest
+    if result.exists():
+        os.remove(temp)
+    else:
+        utils.ensureDirectory(result.parent)
+        os.replace(temp, result)
+    return result
+
+
+def unpackWheel(
+    wheelFile: Path,
+    targetDir: Path,
+    members: Callable[[str], bool] | None = None,
+    store: Path | None = None,
+):
+    """Unpack the wheel, only members accepted by members if given.
+
+    If store is given, files are hardlinked from the content-addressed store,
+    so identical files across versions share storage."""
+
     utils.ensureDirectory(targetDir)
     with zipfile.ZipFile(wheelFile) as f:
-        f.extractall(targetDir)
+        if members is None and store is None:
+            f.extractall(targetDir)
+            return
+
+        root = targetDir.resolve()
+        record = wheelRecord(f) if store else {}
+        for info in f.infolist():
+            if info.is_dir() or (members is not None and not members(info.filename)):
+                continue
+            target = (root / info.filename).resolve()
+            if not target.is_relative_to(root):
+                raise ValueError(f"Unsafe member {info.filename} in {wheelFile}.")
+            if store is None:
+                f.extract(info, root)
+                continue
+
+            # RECORD is not authenticated, its digest only hints a stored object
+            digest = record.get(info.filename, "")
+            item = store / digest[:2] / digest if digest else None
+            if (
+                item is None
+                or not item.is_file()
+                or item.stat().st_size != info.file_size
+                or memberDigest(f, info) != digest
+            ):
+                item = storeMember(f, info, store)
+            utils.ensureDirectory(target.parent)
+            # never write through an existing link into a shared object
+            target.unlink(missing_ok=True)
+            try:
+                os.link(item, target)
+            except OSError as ex:
+                if ex.errno not in (errno.EXDEV, errno.EPERM):
+                    raise
+                shutil.copyfile(item, target)
 
 
 class WheelUnpackPreprocessor(Preprocessor):
-    def __init__(self, /, cacheDir: Path | None, logger: Logger | None = None):
+    def __init__(
+        self,
+        /,
+        cacheDir: Path | None,
+        logger: Logger | None = None,
+        selective: bool = False,
+    ):
         super().__init__(logger)
         self.cacheDir = cacheDir or getCacheDirectory()
+        self.selective = selective
+        """Unpack only metadata and Python sources, hardlinked from a shared store."""
         utils.ensureDirectory(self.cacheDir)
 
     @override
@@ -128,12 +333,32 @@ class WheelUnpackPreprocessor(Preprocessor):
         ), "No wheel file provided."
 
         targetDir = self.cacheDir / product.wheelFile.stem
+        with open(product.wheelFile, "rb") as file:
+            digest = hashlib.file_digest(file, "sha256").hexdigest()
+        state = f"{digest} {'selective' if self.selective else 'full'}"
+        marker = targetDir / UNPACK_MARKER
+
         if targetDir.exists():
+            if marker.is_file() and marker.read_text() == state:
+                self.logger.info(f"Reuse unpacked directory {targetDir}")
+                product.rootPath = targetDir
+                return
             self.logger.warning(f"Remove unpacked directory {targetDir}")
             shutil.rmtree(targetDir)
 
         self.logger.debug(f"Unpacking {product.wheelFile} to {targetDir}")
-        unpackWheel(product.wheelFile, targetDir)
+        if self.selective:
+            with zipfile.ZipFile(product.wheelFile) as f:
+                topModules = product.topModules or wheelTopLevel(f)
+            unpackWheel(
+                product.wheelFile,
+                targetDir,
+                sourceFilter(topModules),
+                self.cacheDir / ".objects",
+            )
+        else:
+            unpackWheel(product.wheelFile, targetDir)
+        marker.write_text(state)
         self.logger.info(f"Unpacked {product.wheelFile} to {targetDir}")
         product.rootPath = targetDir
 
@@ -2,9 +2,10 @@ import io
 import logging
 from abc import ABC
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from logging import Logger
+from timeit import default_timer
 
 from .models import ProduceState, Product
 from .utils import elapsedTimer, getObjectId, logWithStream
@@ -17,9 +18,90 @@ class ProducerOptions:
             setattr(self, k, v)
 
 
+@dataclass(slots=True)
+class ProfileRecord:
+    count: int = 0
+    """Count of invocations."""
+    entries: int = 0
+    """Count of entries produced or evaluated."""
+    total: float = 0
+    """Cumulative wall time in seconds."""
+    max: float = 0
+    """Max wall time of an invocation in seconds."""
+    exceptions: int = 0
+
+
+@dataclass
+class Profiler:
+    """Records of checkers by sections (e.g. constraints, rules) and kinds."""
+
+    records: dict[str, dict[str, ProfileRecord]] = field(default_factory=dict)
+
+    def record(self, /, section: str, kind: str):
+        items = self.records.get(section)
+        if items is None:
+            items = self.records[section] = {}
+        result = items.get(kind)
+        if result is None:
+            result = items[kind] = ProfileRecord()
+        return result
+
+    @contextmanager
+    def timing(self, /, section: str, kind: str):
+        """Provide a context to time an invocation, yield the record to count entries."""
+
+        record = self.record(section, kind)
+        record.count += 1
+        start = default_timer()
+        try:
+            yield record
+        except Exception:
+            record.exceptions += 1
+            raise
+        finally:
+            elapsed = default_timer() - start
+            record.total += elapsed
+            if elapsed > record.max:
+                record.max = elapsed
+
+    def merge(self, /, other: "Profiler"):
+        for section, items in other.records.items():
+            for kind, item in items.items():
+                record = self.record(section, kind)
+                record.count += item.count
+                record.entries += item.entries
+                record.total += item.total
+                record.max = max(record.max, item.max)
+                record.exceptions += item.exceptions
+
+    def dump(self, /):
+        return {
+            section: {kind: asdict(record) for kind, record in items.items()}
+            for section, items in self.records.items()
+        }
+
+    def summary(self, /, top: int = 10):
+        """Return lines of the most time-consuming kinds in each section."""
+
+        result: list[str] = []
+        for section, items in self.records.items():
+            total = sum(x.total for x in items.values())
+            result.append(f"Profile of {len(items)} {section} ({total:.3f}s):")
+            for kind, record in sorted(
+                items.items(), key=lambda x: x[1].total, reverse=True
+            )[:top]:
+                result.append(
+                    f"  {kind}: {record.total:.3f}s (max {record.max:.3f}s), {record.count} calls, {record.entries} entries, {record.exceptions} exceptions"
+                )
+        return result
+
+
 class Producer(ABC):
     """Producer that produces a product."""
 
+    profiler: Profiler | None = None
+    """The profiler for checkers of the producer, set by the produce context."""
+
     @classmethod
     def cls(cls, /):
         return cls.__qualname__
@@ -47,6 +129,8 @@ class ProduceContext[T: Product]:
         self.exception: Exception | None = None
         self.log: str = ""
         self.producers: list[str] = []
+        self.profiler: Profiler | None = None
+        """Profiler passed to the producers in use, None to disable profiling."""
 
     def combinedProducers(self, /, rootProducer: Producer | str = ""):
         if isinstance(rootProducer, Producer):
@@ -60,6 +144,9 @@ class ProduceContext[T: Product]:
     def using[P: Producer](self, /, producer: P):
         originalLogger = producer.logger
         producer.logger = self.logger
+        originalProfiler = producer.profiler
+        if self.profiler is not None:
+            producer.profiler = self.profiler
 
         name = f"{getObjectId(producer.__class__)}: {producer.name}"
         self.logger.debug(f"Using producer {name}")
@@ -76,6 +163,7 @@ class ProduceContext[T: Product]:
                 self.producers.append(producer.name)
                 self.logger.info(f"Used producer {name} ({timer().total_seconds()}s)")
                 producer.logger = originalLogger
+                producer.profiler = originalProfiler
 
 
 @contextmanager
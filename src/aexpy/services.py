@@ -1,5 +1,6 @@
 from contextlib import contextmanager
 from logging import Logger
+from pathlib import Path
 
 from . import SHORT_COMMIT_ID, __version__
 from .diffing import Differ
@@ -7,8 +8,9 @@ from .environments import ExecutionEnvironment, ExecutionEnvironmentBuilder
 from .extracting import Extractor
 from .models import (ApiDescription, ApiDifference, Distribution, Product,
                      Report)
+from .models.difference import DiffIndex
 from .preprocessing import Preprocessor
-from .producers import ProduceContext, produce
+from .producers import ProduceContext, Profiler, produce
 from .reporting import Reporter
 
 
@@ -23,10 +25,12 @@ class ServiceProvider:
 
         return getExtractorEnvironmentBuilder(logger=logger)
 
-    def preprocessor(self, /, logger: Logger | None = None) -> Preprocessor:
+    def preprocessor(
+        self, /, logger: Logger | None = None, cacheDir: Path | None = None
+    ) -> Preprocessor:
         from .preprocessing.counter import FileCounterPreprocessor
 
-        return FileCounterPreprocessor(logger=logger)
+        return FileCounterPreprocessor(logger=logger, cacheDir=cacheDir)
 
     def extractor(
         self, /, logger: Logger | None = None, env: ExecutionEnvironment | None = None
@@ -67,9 +71,10 @@ class ServiceProvider:
         *,
         logger: Logger | None = None,
         context: ProduceContext[Distribution] | None = None,
+        cacheDir: Path | None = None,
     ):
         with self.produce(product, logger=logger, context=context) as context:
-            with context.using(self.preprocessor(context.logger)) as producer:
+            with context.using(self.preprocessor(context.logger, cacheDir)) as producer:
                 producer.preprocess(product)
         return context
 
@@ -92,6 +97,7 @@ class ServiceProvider:
             with envBuilder.use(pyversion=dist.pyversion, logger=context.logger) as env:
                 with context.using(self.extractor(context.logger, env=env)) as producer:
                     producer.extract(dist, context.product)
+            context.product.calcDigests()
         return context
 
     def diff(
@@ -102,14 +108,43 @@ class ServiceProvider:
         *,
         logger: Logger | None = None,
         context: ProduceContext[ApiDifference] | None = None,
+        previous: tuple[ApiDifference, DiffIndex] | None = None,
+        index: DiffIndex | None = None,
+        profiler: Profiler | None = None,
     ):
+        """Diff the descriptions, reusing diff entries of the previous difference if given.
+
+        The index, if given, is filled with fingerprints for later incremental diffs.
+        Descriptions with the same digest have no changes, and are not diffed unless the index is required.
+        The profiler, if given, records constraints and rules, and its summary is logged."""
+
         with self.produce(
             ApiDifference(old=old.distribution, new=new.distribution),
             logger=logger,
             context=context,
         ) as context:
+            if profiler is not None:
+                context.profiler = profiler
+            if index is None and old.digest and old.digest == new.digest:
+                context.logger.info(
+                    f"Skip diffing descriptions with the same digest {old.digest}."
+                )
+                return context
             with context.using(self.differ(context.logger)) as producer:
+                if previous is not None or index is not None:
+                    from .diffing.default import DefaultDiffer
+                    from .diffing.differs.default import ConstraintDiffer
+
+                    if isinstance(producer, (DefaultDiffer, ConstraintDiffer)):
+                        producer.previous = previous
+                        producer.index = index
+                    else:
+                        context.logger.warning(
+                            f"Differ {producer.name} does not support incremental diff."
+                        )
                 producer.diff(old, new, context.product)
+            if profiler is not None:
+                context.logger.info("\n".join(profiler.summary()))
         return context
 
     def report(
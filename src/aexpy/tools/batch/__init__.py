@@ -0,0 +1,465 @@
+import logging
+import multiprocessing
+import os
+import queue
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+from logging import Logger
+from pathlib import Path
+from timeit import default_timer
+from typing import Iterable, Literal, override
+
+from pydantic import BaseModel
+
+from ... import getCacheDirectory
+from ...io import FileProductIO
+from ...io.gzip import GzipFileProductIO, GzipStreamAutoProductLoader
+from ...models import (ApiDescription, ApiDifference, Distribution, Product,
+                       Release, ReleasePair)
+from ...producers import ProduceContext, Producer
+from ...services import ServiceProvider
+from ..matrix import MatrixMode, matrixPairs
+from ..paths import DistPathBuilder
+
+type BatchStage = Literal["preprocess", "extract", "diff", "report"]
+
+IO_STAGES: set[BatchStage] = {"preprocess"}
+"""Stages bound by network and disk, others are bound by CPU."""
+
+
+VERSION_PATTERN = re.compile(
+    r"v?(?:(\d+)!)?(\d+(?:\.\d+)*)"
+    r"(?:[-_.]?(a|b|c|rc|alpha|beta|pre|preview)[-_.]?(\d+)?)?"
+    r"(?:-(\d+)|[-_.]?(post|rev|r)[-_.]?(\d+)?)?"
+    r"(?:[-_.]?(dev)[-_.]?(\d+)?)?"
+    r"(?:\+([a-z0-9]+(?:[-_.][a-z0-9]+)*))?"
+)
+
+PRE_PHASES = {
+    "a": 0,
+    "alpha": 0,
+    "b": 1,
+    "beta": 1,
+    "c": 2,
+    "rc": 2,
+    "pre": 2,
+    "preview": 2,
+}
+
+
+def versionKey(version: str):
+    """Sort key of versions by PEP 440, e.g. 1.10 > 1.9.post1 > 1.9 > 1.9rc1 > 1.9.dev1.
+
+    Invalid versions sort before valid ones, by numeric and textual parts."""
+
+    match = VERSION_PATTERN.fullmatch(version.strip().lower())
+    if match is None:
+        return (-1,) + tuple(
+            (0, int(part)) if part.isdigit() else (-1, part)
+            for part in re.split(r"(\d+)", version.lower())
+            if part and part != "."
+        )
+    epoch, release, phase, pre, implicitPost, postWord, post, dev, devNumber, local = (
+        match.groups()
+    )
+
+    parts = list(map(int, release.split(".")))
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+    if implicitPost is not None:
+        postKey = (0, int(implicitPost))
+    elif postWord:
+        postKey = (0, int(post or 0))
+    else:
+        postKey = (-1,)
+    if phase:
+        preKey = (0, PRE_PHASES[phase], int(pre or 0))
+    elif dev and postKey == (-1,):
+        # 1.0.dev1 < 1.0a1
+        preKey = (-1,)
+    else:
+        preKey = (1,)
+    devKey = (0, int(devNumber or 0)) if dev else (1,)
+    localKey = tuple(
+        (1, int(part)) if part.isdigit() else (0, part)
+        for part in re.split(r"[-_.]", local or "")
+        if part
+    )
+    return (0, int(epoch or 0), tuple(parts), preKey, postKey, devKey, localKey)
+
+
+def parseSpec(spec: str):
+    """Parse a release spec into the project and a version filter.
+
+    Specs are `project`, `project@1.0`, `project@1.0,1.2`, or `project@1.0..2.0`.
+    Bounds of version ranges are optional."""
+
+    project, _, versions = spec.partition("@")
+    if not versions:
+        return project, lambda version: True
+    if ".." in versions:
+        lower, upper = versions.split("..", 1)
+        lowerKey, upperKey = versionKey(lower), versionKey(upper)
+        return project, lambda version: (
+            (not lower or versionKey(version) >= lowerKey)
+            and (not upper or versionKey(version) <= upperKey)
+        )
+    items = set(versions.split(","))
+    return project, lambda version: version in items
+
+
+@dataclass
+class BatchTask:
+    stage: BatchStage
+    target: Release | ReleasePair
+    output: Path
+    inputs: list[Path] = field(default_factory=list)
+    dependencies: list[str] = field(default_factory=list)
+
+    @property
+    def id(self, /):
+        return f"{self.stage}:{self.target}"
+
+
+class BatchEntry(BaseModel):
+    id: str = ""
+    output: str = ""
+    state: Literal["pending", "done", "skipped", "failed", "blocked"] = "pending"
+    duration: timedelta = timedelta(seconds=0)
+    message: str = ""
+
+
+class BatchSummary(Product):
+    projects: dict[str, list[str]] = {}
+    results: list[BatchEntry] = []
+
+    @override
+    def overview(self, /):
+        counts: dict[str, int] = {}
+        for item in self.results:
+            counts[item.state] = counts.get(item.state, 0) + 1
+        return (
+            super().overview()
+            + f"""
+  📚 {len(self.projects)} projects, {sum(len(x) for x in self.projects.values())} releases
+  💠 {len(self.results)} tasks: {', '.join(f'{v} {k}' for k, v in counts.items())}"""
+        )
+
+
+_forked: "BatchRunner | None" = None
+"""Runner state inherited by forked workers."""
+
+
+def _runTask(task: BatchTask):
+    assert _forked is not None
+    return _forked.execute(task)
+
+
+class BatchRunner(Producer):
+    """Run preprocess, extract, diff and report stages as a dependency graph over DistPathBuilder paths."""
+
+    def __init__(
+        self,
+        /,
+        root: Path,
+        logger: Logger | None = None,
+        service: ServiceProvider | None = None,
+        cpuWorkers: int = 1,
+        ioWorkers: int = 4,
+        cacheDir: Path | None = None,
+        env: str = "",
+        temp: bool = False,
+        compress: bool = False,
+        mode: MatrixMode = "adjacent",
+    ) -> None:
+        super().__init__(logger)
+        self.paths = DistPathBuilder(root)
+        self.service = service or ServiceProvider()
+        self.cpuWorkers = cpuWorkers
+        """Count of forked processes for CPU stages, 1 to run them in a thread."""
+        self.ioWorkers = ioWorkers
+        """Count of threads for IO stages."""
+        self.cacheDir = cacheDir or getCacheDirectory()
+        """Directory for downloaded and unpacked wheels, by projects."""
+        self.env = env
+        self.temp = temp
+        self.compress = compress
+        self.mode: MatrixMode = mode
+
+    def releases(self, /, spec: str):
+        """Releases matching the spec in version order, from PyPI or preprocessed distributions."""
+
+        from ...preprocessing.pypi import getReleases
+
+        project, accepts = parseSpec(spec)
+        found = getReleases(project)
+        if found is None:
+            self.logger.warning(
+                f"Failed to get releases of {project}, use preprocessed distributions."
+            )
+            versions = [item.version for item in self.paths.distributions(project)]
+        else:
+            versions = [version for version, files in found.items() if files]
+        if "@" in spec and ".." not in spec:
+            # explicit versions may be not on PyPI
+            versions.extend(spec.partition("@")[2].split(","))
+        return [
+            Release(project=project, version=version)
+            for version in sorted(set(filter(accepts, versions)), key=versionKey)
+        ]
+
+    def collect(self, /, specs: Iterable[str]):
+        """Releases of specs by projects, in version order."""
+
+        result: dict[str, dict[str, Release]] = {}
+        for spec in specs:
+            for release in self.releases(spec):
+                result.setdefault(release.project, {})[release.version] = release
+        return {
+            project: sorted(releases.values(), key=lambda x: versionKey(x.version))
+            for project, releases in result.items()
+        }
+
+    def plan(self, /, projects: dict[str, list[Release]]):
+        """Tasks by ids, dependencies come before dependents."""
+
+        result: dict[str, BatchTask] = {}
+
+        def add(task: BatchTask):
+            result[task.id] = task
+            return task
+
+        for releases in projects.values():
+            extracts: list[BatchTask] = []
+            for release in releases:
+                preprocess = add(
+                    BatchTask("preprocess", release, self.paths.preprocess(release))
+                )
+                extracts.append(
+                    add(
+                        BatchTask(
+                            "extract",
+                            release,
+                            self.paths.extract(release),
+                            [preprocess.output],
+                            [preprocess.id],
+                        )
+                    )
+                )
+            for old, new in matrixPairs(len(releases), self.mode):
+                pair = ReleasePair(old=releases[old], new=releases[new])
+                diff = add(
+                    BatchTask(
+                        "diff",
+                        pair,
+                        self.paths.diff(pair),
+                        [extracts[old].output, extracts[new].output],
+                        [extracts[old].id, extracts[new].id],
+                    )
+                )
+                add(
+                    BatchTask(
+                        "report",
+                        pair,
+                        self.paths.report(pair),
+                        [diff.output],
+                        [diff.id],
+                    )
+                )
+        return result
+
+    def upToDate(self, /, task: BatchTask):
+        if not task.output.is_file():
+            return False
+        mtime = task.output.stat().st_mtime
+        return all(
+            item.is_file() and item.stat().st_mtime <= mtime for item in task.inputs
+        )
+
+    def load[T: Product](self, /, path: Path, cls: type[T]) -> T:
+        with path.open("rb") as f:
+            return GzipStreamAutoProductLoader(f).load(cls)
+
+    def save(self, /, task: BatchTask, context: ProduceContext):
+        """Save the log, and the product only if it succeeded, so failed tasks rerun."""
+
+        temp = task.output.with_name(f"{task.output.name}.tmp")
+        io = GzipFileProductIO if self.compress else FileProductIO
+        io(temp, task.output.with_suffix(".log")).save(context.product, context.log)
+        if context.product.success:
+            os.replace(temp, task.output)
+        else:
+            temp.unlink()
+
+    def execute(self, /, task: BatchTask) -> tuple[bool, str]:
+        """Run the task and save its outputs, return whether it succeeded and the error message."""
+
+        from ...cli import extractCore, preprocessCore
+
+        logger = logging.getLogger(f"batch.{task.id}")
+        try:
+            match task.stage:
+                case "preprocess":
+                    assert isinstance(task.target, Release)
+                    cacheDir = self.cacheDir / task.target.project
+                    cacheDir.mkdir(parents=True, exist_ok=True)
+                    context = preprocessCore(
+                        self.service,
+                        cacheDir,
+                        project=str(task.target),
+                        mode="release",
+                        logger=logger,
+                    )
+                case "extract":
+                    context = extractCore(
+                        self.service,
+                        self.load(task.inputs[0], Distribution),
+                        env=self.env,
+                        temp=self.temp,
+                        logger=logger,
+                    )
+                case "diff":
+                    context = self.service.diff(
+                        self.load(task.inputs[0], ApiDescription),
+                        self.load(task.inputs[1], ApiDescription),
+                        logger=logger,
+                    )
+                case "report":
+                    context = self.service.report(
+                        self.load(task.inputs[0], ApiDifference), logger=logger
+                    )
+            self.save(task, context)
+            if context.product.success:
+                return True, ""
+            return False, str(context.exception)
+        except Exception as ex:
+            logger.error(f"Failed to run {task.id}.", exc_info=True)
+            return False, str(ex)
+
+    def run(self, /, tasks: dict[str, BatchTask], product: BatchSummary):
+        global _forked
+
+        entries = {
+            id: BatchEntry(id=id, output=str(task.output)) for id, task in tasks.items()
+        }
+        product.results = list(entries.values())
+        remaining = {id: len(task.dependencies) for id, task in tasks.items()}
+        dependents: dict[str, list[str]] = {}
+        for task in tasks.values():
+            for dependency in task.dependencies:
+                dependents.setdefault(dependency, []).append(task.id)
+
+        events: queue.Queue[tuple[str, bool, str]] = queue.Queue()
+        starts: dict[str, float] = {}
+        start = default_timer()
+        finished = 0
+        running = 0
+
+        def report(id: str):
+            entry = entries[id]
+            self.logger.info(
+                f"[{finished}/{len(tasks)}] {entry.state} {id} ({entry.duration.total_seconds():.2f}s, {finished / max(default_timer() - start, 1e-9):.2f} tasks/s){f': {entry.message}' if entry.message else ''}"
+            )
+
+        def block(id: str, reason: str):
+            nonlocal finished
+            if entries[id].state != "pending":
+                return
+            entries[id].state = "blocked"
+            entries[id].message = f"Blocked by {reason}."
+            finished += 1
+            report(id)
+            for dependent in dependents.get(id, []):
+                block(dependent, reason)
+
+        def complete(id: str, success: bool, message: str, state: str):
+            nonlocal finished
+            entry = entries[id]
+            entry.state = state  # type: ignore
+            entry.message = message
+            if id in starts:
+                entry.duration = timedelta(seconds=default_timer() - starts[id])
+            finished += 1
+            report(id)
+            for dependent in dependents.get(id, []):
+                if not success:
+                    block(dependent, id)
+                    continue
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0 and entries[dependent].state == "pending":
+                    launch(dependent)
+
+        def launch(id: str):
+            nonlocal running
+            task = tasks[id]
+            if self.upToDate(task):
+                complete(id, True, "", "skipped")
+                return
+            starts[id] = default_timer()
+            running += 1
+            submit = submitIO if task.stage in IO_STAGES else submitCPU
+            submit(task)
+
+        _forked = self
+        cpuPool = None
+        if self.cpuWorkers > 1:
+            if "fork" in multiprocessing.get_all_start_methods():
+                # fork workers before starting any thread
+                cpuPool = multiprocessing.get_context("fork").Pool(self.cpuWorkers)
+            else:
+                self.logger.warning("Fork is not supported, run CPU stages in threads.")
+        try:
+            with (
+                ThreadPoolExecutor(self.ioWorkers, "batch-io") as ioPool,
+                ThreadPoolExecutor(
+                    1 if cpuPool else self.cpuWorkers, "batch-cpu"
+                ) as cpuThreads,
+            ):
+
+                def watch(id: str, future: Future[tuple[bool, str]]):
+                    future.add_done_callback(
+                        lambda f: events.put(
+                            (id, False, str(f.exception()))
+                            if f.exception() is not None
+                            else (id, *f.result())
+                        )
+                    )
+
+                def submitIO(task: BatchTask):
+                    watch(task.id, ioPool.submit(self.execute, task))
+
+                def submitCPU(task: BatchTask):
+                    if cpuPool is None:
+                        watch(task.id, cpuThreads.submit(self.execute, task))
+                        return
+                    cpuPool.apply_async(
+                        _runTask,
+                        (task,),
+                        callback=lambda result: events.put((task.id, *result)),
+                        error_callback=lambda ex: events.put((task.id, False, str(ex))),
+                    )
+
+                self.logger.info(
+                    f"Run {len(tasks)} tasks by {self.ioWorkers} IO workers and {self.cpuWorkers} CPU workers."
+                )
+
+                for id in [id for id, count in remaining.items() if count == 0]:
+                    launch(id)
+
+                while running > 0:
+                    id, success, message = events.get()
+                    running -= 1
+                    complete(id, success, message, "done" if success else "failed")
+        finally:
+            _forked = None
+            if cpuPool is not None:
+                cpuPool.close()
+                cpuPool.join()
+
+        failures = [x.id for x in product.results if x.state == "failed"]
+        if failures:
+            raise Exception(
+                f"Failed to run {len(failures)} tasks: {', '.join(failures)}."
+            )
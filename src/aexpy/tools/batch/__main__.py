@@ -0,0 +1,4 @@
+from .cli import batch as main
+
+if __name__ == "__main__":
+    main()
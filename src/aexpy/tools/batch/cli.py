@@ -0,0 +1,127 @@
+import code
+import sys
+from pathlib import Path
+from typing import IO
+
+import click
+
+from ... import runInContainer
+from ...cli import CliContext, StreamProductSaver, exitWithContext
+from ...producers import produce
+from ..matrix import MatrixMode
+from . import BatchRunner, BatchSummary
+
+
+@click.command()
+@click.pass_context
+@click.argument(
+    "root",
+    type=click.Path(file_okay=False, resolve_path=True, path_type=Path),
+)
+@click.argument("specs", nargs=-1, required=True)
+@click.option(
+    "-o",
+    "--output",
+    type=click.File("wb"),
+    default="-",
+    help="Output summary file (in json format), default to stdout.",
+)
+@click.option(
+    "-m",
+    "--mode",
+    type=click.Choice(["adjacent", "latest", "all"]),
+    default="adjacent",
+    help="Release pairs to diff and report.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(1),
+    default=1,
+    help="Count of worker processes for extract, diff and report.",
+)
+@click.option(
+    "--io-jobs",
+    "ioJobs",
+    type=click.IntRange(1),
+    default=4,
+    help="Count of worker threads for preprocess (download and unpack).",
+)
+@click.option(
+    "-c",
+    "--cache",
+    type=click.Path(file_okay=False, resolve_path=True, path_type=Path),
+    default=None,
+    help="Cache directory for wheels, default to the AexPy cache directory.",
+)
+@click.option(
+    "-e",
+    "--env",
+    type=str,
+    default="",
+    help="Env name for extraction, if given, temp option is ignored.",
+)
+@click.option(
+    "--temp/--no-temp",
+    default=runInContainer(),
+    help="Create a temporary env for extraction, false to use current env.",
+)
+def batch(
+    ctx: click.Context,
+    root: Path,
+    specs: tuple[str],
+    output: IO[bytes],
+    mode: MatrixMode = "adjacent",
+    jobs: int = 1,
+    ioJobs: int = 4,
+    cache: Path | None = None,
+    env: str = "",
+    temp: bool = False,
+):
+    """Run the pipeline for releases of projects.
+
+    ROOT describes the data directory, organized by projects and stages.
+
+    SPECS describes releases, e.g. `project` for all releases, `project@1.0,1.1` for given versions, or `project@1.0..2.0` for a version range (bounds are optional).
+
+    Preprocess, extract, diff and report run as a dependency graph, independent tasks run concurrently.
+    Existing outputs newer than their inputs are skipped, so a crashed run resumes by running it again.
+
+    Examples:
+
+    aexpy tool batch ./data generator-oj-problem@0.0.1..0.0.3 -o summary.json
+
+    aexpy tool batch ./data click@8.0.0.. flask@3.0.0,3.0.1 -j 4 -m latest
+    """
+    clictx = ctx.ensure_object(CliContext)
+
+    with produce(BatchSummary(), service=clictx.service.name) as context:
+        with context.using(
+            BatchRunner(
+                root,
+                service=clictx.service,
+                cpuWorkers=jobs,
+                ioWorkers=ioJobs,
+                cacheDir=cache,
+                env=env,
+                temp=temp,
+                compress=clictx.compress,
+                mode=mode,
+            )
+        ) as runner:
+            projects = runner.collect(specs)
+            context.product.projects = {
+                project: [item.version for item in releases]
+                for project, releases in projects.items()
+            }
+            runner.run(runner.plan(projects), context.product)
+
+    result = context.product
+    StreamProductSaver(output, gzip=clictx.compress).save(result, context.log)
+
+    print(result.overview(), file=sys.stderr)
+
+    if clictx.interact:
+        code.interact(banner="", local=locals())
+
+    exitWithContext(context=context)
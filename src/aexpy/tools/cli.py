@@ -2,13 +2,36 @@ import logging
 import pkgutil
 from logging import Logger
 from pathlib import Path
+from typing import Callable, override
 
 import click
 
 from ..cli import AliasedGroup
 
 
-@click.group(cls=AliasedGroup)
+class ToolGroup(AliasedGroup):
+    """Group loading commands of tools on first lookup, so other commands start quickly."""
+
+    def __init__(self, /, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.loaders: list[Callable[[], None]] = []
+
+    def load(self, /):
+        while self.loaders:
+            self.loaders.pop(0)()
+
+    @override
+    def list_commands(self, /, ctx: click.Context):
+        self.load()
+        return super().list_commands(ctx)
+
+    @override
+    def get_command(self, /, ctx: click.Context, cmd_name: str):
+        self.load()
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(cls=ToolGroup)
 @click.pass_context
 def tool(
     ctx: click.Context,
@@ -29,27 +52,36 @@ def build(
 
     root = Path(path) if path else Path(__file__).parent
     name = name or __name__.rsplit(".", maxsplit=1)[0]
-    for sub in pkgutil.iter_modules(path=[str(root)], prefix=""):
-        if not sub.ispkg:
-            continue
-        for ssub in pkgutil.iter_modules(path=[str(root / sub.name)], prefix=""):
-            if ssub.name != "cli":
+
+    def load():
+        for sub in pkgutil.iter_modules(path=[str(root)], prefix=""):
+            if not sub.ispkg:
                 continue
-            cmds: list[click.Command] = []
-            modname = f"{name or __name__}.{sub.name}.{ssub.name}"
-            try:
-                climod = importlib.import_module(modname)
-                subBuild = getattr(climod, "build", None)
-                if subBuild:
-                    cmds.extend(subBuild(logger=logger))
-                else:
-                    for item in dir(climod):
-                        subval = getattr(climod, item)
-                        if isinstance(subval, click.Command):
-                            cmds.append(subval)
-            except Exception:
-                logger.error(f"Failed to load {modname}", exc_info=True)
-            logger.debug(f"Found commands under {modname}: {cmds}")
-            for cmd in cmds:
-                mainCommand.add_command(cmd)
+            for ssub in pkgutil.iter_modules(path=[str(root / sub.name)], prefix=""):
+                if ssub.name != "cli":
+                    continue
+                cmds: list[click.Command] = []
+                modname = f"{name or __name__}.{sub.name}.{ssub.name}"
+                try:
+                    climod = importlib.import_module(modname)
+                    subBuild = getattr(climod, "build", None)
+                    if subBuild:
+                        cmds.extend(subBuild(logger=logger))
+                    else:
+                        for item in dir(climod):
+                            subval = getattr(climod, item)
+                            if isinstance(subval, click.Command):
+                                cmds.append(subval)
+                except Exception:
+                    logger.error(f"Failed to load {modname}", exc_info=True)
+                logger.debug(f"Found commands under {modname}: {cmds}")
+                for cmd in cmds:
+                    if cmd.name in mainCommand.commands:
+                        logger.error(
+                            f"Duplicate command {cmd.name} under {modname}, skipped."
+                        )
+                        continue
+                    mainCommand.add_command(cmd)
+
+    mainCommand.loaders.append(load)
     return [mainCommand]
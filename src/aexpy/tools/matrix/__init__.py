@@ -0,0 +1,199 @@
+import multiprocessing
+from collections import OrderedDict
+from datetime import timedelta
+from logging import Logger
+from pathlib import Path
+from timeit import default_timer
+from typing import Literal, override
+
+from pydantic import BaseModel
+
+from ...io import FileProductIO
+from ...io.gzip import GzipFileProductIO, GzipStreamAutoProductLoader
+from ...models import ApiDescription, ProduceState, Product
+from ...producers import Producer
+from ...services import ServiceProvider
+
+type MatrixMode = Literal["adjacent", "latest", "all"]
+
+
+def matrixPairs(count: int, mode: MatrixMode) -> list[tuple[int, int]]:
+    """Return index pairs of descriptions to diff, grouped by the old description."""
+
+    match mode:
+        case "adjacent":
+            return [(i, i + 1) for i in range(count - 1)]
+        case "latest":
+            return [(i, count - 1) for i in range(count - 1)]
+        case "all":
+            return [(i, j) for i in range(count) for j in range(i + 1, count)]
+
+
+class DescriptionCache:
+    """Bounded LRU of API descriptions loaded from files."""
+
+    def __init__(self, /, size: int = 8) -> None:
+        self.size = max(1, size)
+        self.items: OrderedDict[Path, ApiDescription] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, /, path: Path):
+        result = self.items.get(path)
+        if result is not None:
+            self.hits += 1
+            self.items.move_to_end(path)
+            return result
+
+        self.misses += 1
+        with path.open("rb") as f:
+            result = GzipStreamAutoProductLoader(f).load(ApiDescription)
+        self.items[path] = result
+        while len(self.items) > self.size:
+            self.items.popitem(last=False)
+        return result
+
+
+class MatrixEntry(BaseModel):
+    old: str = ""
+    new: str = ""
+    file: str = ""
+    state: ProduceState = ProduceState.Pending
+    duration: timedelta = timedelta(seconds=0)
+    entries: int = 0
+    loads: int = 0
+    """Count of descriptions parsed for this pair."""
+
+
+class DiffMatrix(Product):
+    mode: str = ""
+    files: list[str] = []
+    results: list[MatrixEntry] = []
+
+    @override
+    def overview(self, /):
+        success = sum(1 for x in self.results if x.state == ProduceState.Success)
+        loads = sum(x.loads for x in self.results)
+        return (
+            super().overview()
+            + f"""
+  📚 {len(self.files)} descriptions, {loads} loads
+  💠 {len(self.results)} pairs ({self.mode}), {success} succeeded, {len(self.results) - success} failed"""
+        )
+
+
+_forked: "MatrixDiffer | None" = None
+"""Differ state inherited by forked workers."""
+
+
+def _diffChunk(tasks: list[tuple[int, int]]):
+    assert _forked is not None
+    return [_forked.diffPair(old, new) for old, new in tasks]
+
+
+class MatrixDiffer(Producer):
+    """Diff pairs of a release series, loading each description once per worker."""
+
+    def __init__(
+        self,
+        /,
+        output: Path,
+        logger: Logger | None = None,
+        service: ServiceProvider | None = None,
+        workers: int = 1,
+        cacheSize: int = 8,
+        compress: bool = False,
+    ) -> None:
+        super().__init__(logger)
+        self.output = output
+        self.service = service or ServiceProvider()
+        self.workers = workers
+        """Count of forked processes diffing pairs, 1 to diff in process."""
+        self.cache = DescriptionCache(cacheSize)
+        self.compress = compress
+        self.files: list[Path] = []
+
+    def target(self, /, old: ApiDescription, new: ApiDescription):
+        oldRelease, newRelease = old.single(), new.single()
+        if oldRelease.project == newRelease.project:
+            name = f"{oldRelease.version}&{newRelease.version}.json"
+        else:
+            name = f"{oldRelease}&{newRelease}.json"
+        return self.output / name
+
+    def diffPair(self, /, old: int, new: int):
+        result = MatrixEntry(old=str(self.files[old]), new=str(self.files[new]))
+        start = default_timer()
+        misses = self.cache.misses
+        try:
+            oldData = self.cache.get(self.files[old])
+            newData = self.cache.get(self.files[new])
+            result.loads = self.cache.misses - misses
+
+            context = self.service.diff(oldData, newData, logger=self.logger)
+            target = self.target(oldData, newData)
+            io = GzipFileProductIO if self.compress else FileProductIO
+            io(target, target.with_suffix(".log")).save(context.product, context.log)
+
+            result.file = str(target)
+            result.state = context.product.state
+            result.entries = len(context.product.entries)
+        except Exception:
+            self.logger.error(
+                f"Failed to diff {self.files[old]} and {self.files[new]}.",
+                exc_info=True,
+            )
+            result.loads = self.cache.misses - misses
+            result.state = ProduceState.Failure
+        result.duration = timedelta(seconds=default_timer() - start)
+        return result
+
+    def chunks(self, /, pairs: list[tuple[int, int]]):
+        size = max(1, min(64, len(pairs) // (self.workers * 4) or 1))
+        return [pairs[i : i + size] for i in range(0, len(pairs), size)]
+
+    def results(self, /, pairs: list[tuple[int, int]]):
+        """Yield results in the order of pairs."""
+
+        global _forked
+
+        if self.workers > 1:
+            if "fork" in multiprocessing.get_all_start_methods():
+                _forked = self
+                try:
+                    with multiprocessing.get_context("fork").Pool(self.workers) as pool:
+                        for results in pool.imap(_diffChunk, self.chunks(pairs)):
+                            yield from results
+                finally:
+                    _forked = None
+                return
+            self.logger.warning("Fork is not supported, diff pairs in process.")
+
+        for old, new in pairs:
+            yield self.diffPair(old, new)
+
+    def diff(self, /, files: list[Path], product: DiffMatrix, mode: MatrixMode):
+        self.files = files
+        product.mode = mode
+        product.files = [str(file) for file in files]
+        pairs = matrixPairs(len(files), mode)
+
+        self.logger.info(
+            f"Diff {len(pairs)} pairs of {len(files)} descriptions ({mode}) by {self.workers} workers."
+        )
+
+        start = default_timer()
+        for result in self.results(pairs):
+            product.results.append(result)
+            done = len(product.results)
+            elapsed = default_timer() - start
+            self.logger.info(
+                f"[{done}/{len(pairs)}] {result.state.name} {result.old} -> {result.new} "
+                f"({result.entries} entries, {result.duration.total_seconds():.2f}s, "
+                f"{done / elapsed if elapsed else 0:.2f} pairs/s)"
+            )
+
+        loads = sum(x.loads for x in product.results)
+        self.logger.info(
+            f"Parsed {loads} descriptions for {len(pairs)} pairs in {default_timer() - start:.2f}s."
+        )
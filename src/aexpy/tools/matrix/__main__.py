@@ -0,0 +1,4 @@
+from .cli import matrix as main
+
+if __name__ == "__main__":
+    main()
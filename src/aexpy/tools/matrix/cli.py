@@ -0,0 +1,96 @@
+import code
+import sys
+from pathlib import Path
+from typing import IO
+
+import click
+
+from ...cli import CliContext, StreamProductSaver, exitWithContext
+from ...producers import produce
+from . import DiffMatrix, MatrixDiffer, MatrixMode
+
+
+@click.command()
+@click.pass_context
+@click.argument(
+    "files",
+    nargs=-1,
+    type=click.Path(
+        exists=True, dir_okay=False, file_okay=True, resolve_path=True, path_type=Path
+    ),
+)
+@click.argument("output", type=click.File("wb"))
+@click.option(
+    "-d",
+    "--directory",
+    type=click.Path(file_okay=False, resolve_path=True, path_type=Path),
+    default=Path("."),
+    help="Directory for API difference files.",
+)
+@click.option(
+    "-m",
+    "--mode",
+    type=click.Choice(["adjacent", "latest", "all"]),
+    default="adjacent",
+    help="Pairs to diff: adjacent releases, each release against the latest, or all pairs.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(1),
+    default=1,
+    help="Count of worker processes.",
+)
+@click.option(
+    "-c",
+    "--cache",
+    type=click.IntRange(1),
+    default=8,
+    help="Count of parsed API descriptions kept per worker.",
+)
+def matrix(
+    ctx: click.Context,
+    files: tuple[Path],
+    output: IO[bytes],
+    directory: Path = Path("."),
+    mode: MatrixMode = "adjacent",
+    jobs: int = 1,
+    cache: int = 8,
+):
+    """Diff pairs of a release series.
+
+    FILES give paths to API descriptions of the releases, in release order.
+
+    OUTPUT describes the output summary file (in json format, use `-` for stdout).
+
+    Each API difference is saved in DIRECTORY as `old&new.json` with its log.
+
+    Examples:
+
+    aexpy tool matrix apis/1.0.json apis/1.1.json apis/2.0.json matrix.json -d changes
+
+    aexpy tool matrix apis/*.json matrix.json -d changes -m all -j 4
+    """
+    clictx = ctx.ensure_object(CliContext)
+
+    with produce(DiffMatrix(), service=clictx.service.name) as context:
+        with context.using(
+            MatrixDiffer(
+                directory,
+                service=clictx.service,
+                workers=jobs,
+                cacheSize=cache,
+                compress=clictx.compress,
+            )
+        ) as differ:
+            differ.diff(list(files), context.product, mode)
+
+    result = context.product
+    StreamProductSaver(output, gzip=clictx.compress).save(result, context.log)
+
+    print(result.overview(), file=sys.stderr)
+
+    if clictx.interact:
+        code.interact(banner="", local=locals())
+
+    exitWithContext(context=context)
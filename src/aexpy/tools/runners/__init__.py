@@ -1,8 +1,8 @@
 import gzip
 import logging
 import os
-import shutil
 import subprocess
+from contextlib import contextmanager
 from dataclasses import dataclass
 from logging import Logger
 from pathlib import Path
@@ -13,7 +13,6 @@ from ... import __version__, getEnvironmentManager
 from ...cli import CliOptions
 from ...diffing import Differ
 from ...extracting import Extractor
-from ...io import StreamProductSaver
 from ...models import (ApiDescription, ApiDifference, Distribution, Product,
                        Report)
 from ...producers import Producer
@@ -47,6 +46,8 @@ class AexPyRunner:
         self.cli = cli or CliOptions()
         self.logger = logger or logging.getLogger()
         self.cwd = cwd or Path(os.getcwd()).resolve()
+        self.mounts: list[tuple[Path, Path]] = []
+        """Host paths exposed read-only to the runner, with the paths seen by it."""
 
     def getCommandPrefix(self, /):
         return ["aexpy"]
@@ -54,6 +55,11 @@ class AexPyRunner:
     def resolvePath(self, /, path: Path):
         return path
 
+    def mount(self, /, path: Path, name: str):
+        """Expose a host path read-only to the runner and return the path seen by it."""
+
+        return path.resolve()
+
     def run(self, /, args: list[str], **kwargs) -> subprocess.CompletedProcess[bytes]:
         args = self.getCommandPrefix() + self.cli.args() + args
         self.logger.debug(f"Runner run args: {args}")
@@ -78,6 +84,8 @@ class AexPyRunner:
         return result
 
     def runParsedOutput[T: Product](self, /, type: type[T], args: list[str], **kwargs):
+        """Run the command writing its product to stdout, pass input to feed stdin."""
+
         res = self.run(args + ["-"], **kwargs)
         result = AexPyResult[T](code=res.returncode, log=res.stderr, out=res.stdout)
         try:
@@ -166,6 +174,10 @@ class AexPyDockerRunner(AexPyRunner):
         except Exception:
             pass
 
+        volumes: list[str] = []
+        for source, target in self.mounts:
+            volumes += ["-v", f"{source}:{target}:ro"]
+
         return (
             [
                 "docker",
@@ -173,6 +185,9 @@ class AexPyDockerRunner(AexPyRunner):
                 "-i",
                 "-v",
                 f"{str(self.cwd.resolve())}:/data",
+            ]
+            + volumes
+            + [
                 "-u",
                 user,
                 "--rm",
@@ -185,6 +200,29 @@ class AexPyDockerRunner(AexPyRunner):
     def resolvePath(self, /, path):
         return Path("/data/").joinpath(path.relative_to(self.cwd))
 
+    @override
+    def mount(self, /, path, name):
+        target = Path("/mnt").joinpath(name)
+        self.mounts.append((path.resolve(), target))
+        return target
+
+
+def assignProduct[T: Product](product: T, data: T):
+    """Move the fields of a parsed product into the given one, without dumping and validating them again."""
+
+    for name in type(data).model_fields:
+        setattr(product, name, getattr(data, name))
+
+
+def mountDistribution(dist: Distribution, runner: AexPyRunner):
+    assert (
+        dist.rootPath and dist.rootPath.is_dir()
+    ), "Distribution root file not exists."
+    result = dist.model_copy(update={"rootPath": runner.mount(dist.rootPath, "src")})
+    if dist.wheelFile:
+        result.wheelFile = runner.mount(dist.wheelFile, f"wheel/{dist.wheelFile.name}")
+    return result
+
 
 class RunnerProducer(Producer):
     def __init__(
@@ -193,6 +231,21 @@ class RunnerProducer(Producer):
         super().__init__(logger)
         self.runner = runner
 
+    @contextmanager
+    def open(self, /):
+        """Yield a runner working in an empty temporary directory, inputs are fed by stdin."""
+
+        with TemporaryDirectory() as tdir:
+            yield self.runner(Path(tdir).resolve())
+
+    def receive[T: Product](self, /, result: AexPyResult[T], product: T):
+        self.logger.debug(
+            f"Internal runner exited with {result.code}\n{result.log.decode()}"
+        )
+        data = result.ensure().data
+        assert data is not None
+        assignProduct(product, data)
+
 
 class RunnerDiffer(Differ, RunnerProducer):
     @override
@@ -203,79 +256,22 @@ class RunnerDiffer(Differ, RunnerProducer):
         new: ApiDescription,
         product: ApiDifference,
     ):
-        with TemporaryDirectory() as tdir:
-            temp = Path(tdir).resolve()
-            runner = self.runner(temp)
-
-            fold = temp / "old.json"
-            fnew = temp / "new.json"
-            with fold.open("wb") as f:
-                StreamProductSaver(f).save(old, "")
-            with fnew.open("wb") as f:
-                StreamProductSaver(f).save(new, "")
-
-            result = runner.diff([fold, fnew])
-            self.logger.debug(f"Internal runner exited with {result.code}")
-            self.logger.debug("Inner log: " + result.log.decode())
-            data = result.ensure().data
-            assert data is not None
-            product.__init__(**data.model_dump())
+        with self.open() as runner:
+            input = b",".join(item.model_dump_json().encode() for item in (old, new))
+            self.receive(runner.diff(["-", "-"], input=input), product)
 
 
 class RunnerReporter(Reporter, RunnerProducer):
     @override
     def report(self, /, diff: ApiDifference, product: Report):
-        with TemporaryDirectory() as tdir:
-            temp = Path(tdir).resolve()
-            runner = self.runner(temp)
-
-            file = temp / "diff.json"
-            with file.open("wb") as f:
-                StreamProductSaver(f).save(diff, "")
-
-            result = runner.report([file])
-            self.logger.debug(f"Internal runner exited with {result.code}")
-            self.logger.debug("Inner log: " + result.log.decode())
-            data = result.ensure().data
-            assert data is not None
-            product.__init__(**data.model_dump())
-
-
-def cloneDistribution(dist: Distribution, target: Path):
-    assert (
-        dist.rootPath and dist.rootPath.is_dir()
-    ), "Distribution root file not exists."
-    src = target / "src"
-    assert not src.exists(), f"Target subdirectory exists: {src}."
-    shutil.copytree(dist.rootPath, src)
-    result = dist.model_copy(update={"rootPath": src})
-    if dist.wheelFile:
-        wheel = target / dist.wheelFile.name
-        shutil.copy(dist.wheelFile, wheel)
-        result.wheelFile = wheel
-    return result
+        with self.open() as runner:
+            input = diff.model_dump_json().encode()
+            self.receive(runner.report(["-"], input=input), product)
 
 
 class RunnerExtractor(Extractor, RunnerProducer):
     @override
     def extract(self, /, dist, product):
-        with TemporaryDirectory() as tdir:
-            temp = Path(tdir).resolve()
-            runner = self.runner(temp)
-            cloned = cloneDistribution(dist, temp)
-            if cloned.rootPath:
-                cloned.rootPath = runner.resolvePath(cloned.rootPath)
-            if cloned.wheelFile:
-                cloned.wheelFile = runner.resolvePath(cloned.wheelFile)
-
-            file = temp / "dist.json"
-            with file.open("wb") as f:
-                StreamProductSaver(f).save(cloned, "")
-
-            result = runner.extract([file, "--temp"])
-            self.logger.debug(
-                f"Internal runner exited with {result.code}\n{result.log.decode()}"
-            )
-            data = result.ensure().data
-            assert data is not None
-            product.__init__(**data.model_dump())
+        with self.open() as runner:
+            input = mountDistribution(dist, runner).model_dump_json().encode()
+            self.receive(runner.extract(["-", "-j", "--temp"], input=input), product)
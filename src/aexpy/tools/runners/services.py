@@ -19,7 +19,7 @@ class RunnerServiceProvider(ServiceProvider):
         def build(path: Path):
             return AexPyRunner(
                 cwd=path,
-                cli=CliOptions(verbose=5, compress=True),
+                cli=CliOptions(verbose=5, compress=False),
                 logger=logger,
             )
 
@@ -53,7 +53,7 @@ class DockerRunnerServiceProvider(RunnerServiceProvider):
             return AexPyDockerRunner(
                 tag=self.tag,
                 cwd=path,
-                cli=CliOptions(verbose=5, compress=True),
+                cli=CliOptions(verbose=5, compress=False),
                 logger=logger,
             )
 
@@ -0,0 +1,18 @@
+import os
+import tempfile
+from pathlib import Path
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+def getSocketPath() -> Path:
+    """Return the default unix socket path of the server, overridden by AEXPY_SOCKET."""
+
+    env = os.getenv("AEXPY_SOCKET")
+    if env:
+        return Path(env)
+    return Path(tempfile.gettempdir()) / f"aexpy-{os.getuid()}.sock"
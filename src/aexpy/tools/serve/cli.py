@@ -0,0 +1,69 @@
+import logging
+from pathlib import Path
+
+import click
+
+from ...cli import CliContext
+from . import getSocketPath
+
+
+@click.command("daemon")
+@click.pass_context
+@click.option(
+    "-S",
+    "--socket",
+    "socketPath",
+    type=click.Path(dir_okay=False, resolve_path=True, path_type=Path),
+    default=None,
+    help="Unix socket path, default to $AEXPY_SOCKET or aexpy-<uid>.sock in the temp directory.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(1),
+    default=2,
+    help="Count of requests produced at the same time.",
+)
+@click.option(
+    "-c",
+    "--cache",
+    "cacheSize",
+    type=click.IntRange(1),
+    default=32,
+    help="Count of parsed products kept in memory.",
+)
+def daemon(
+    ctx: click.Context,
+    socketPath: Path | None = None,
+    jobs: int = 2,
+    cacheSize: int = 32,
+):
+    """Run a resident server answering requests over a unix socket.
+
+    The server keeps the service, imported producers and parsed products in memory,
+    and answers JSON-RPC 2.0 requests, one JSON object per line, for methods
+    preprocess, extract, diff, report, stat, status and shutdown.
+
+    Results are saved to the `output` parameter, with the log beside it.
+    Relative paths are resolved against the `cwd` parameter.
+
+    Examples:
+
+    aexpy tool daemon -j 4
+
+    python -m aexpy.tools.serve.client diff old=api1.json new=api2.json output=changes.json
+
+    python -m aexpy.tools.serve.client shutdown
+    """
+    from .server import AexpyServer
+
+    clictx = ctx.ensure_object(CliContext)
+
+    server = AexpyServer(
+        clictx.service,
+        logger=logging.getLogger(),
+        jobs=jobs,
+        cacheSize=cacheSize,
+        compress=clictx.compress,
+    )
+    server.serve(socketPath or getSocketPath())
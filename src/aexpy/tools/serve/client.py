@@ -0,0 +1,90 @@
+"""Thin client of the AexPy server, importing nothing beyond the standard library.
+
+Usage: python -m aexpy.tools.serve.client METHOD [KEY=VALUE ...]
+
+Values are parsed as JSON if possible, otherwise kept as strings.
+Relative paths are resolved against the working directory of the client."""
+
+import itertools
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any
+
+from . import getSocketPath
+
+_ids = itertools.count(1)
+
+
+class RemoteError(Exception):
+    def __init__(self, /, code: int, message: str, data: Any = None) -> None:
+        super().__init__(f"{message} ({code})")
+        self.code = code
+        self.data = data
+
+
+def request(
+    method: str,
+    params: dict[str, Any] | None = None,
+    path: Path | None = None,
+    timeout: float | None = None,
+) -> Any:
+    """Send a JSON-RPC request to the server and return its result."""
+
+    params = dict(params or {})
+    params.setdefault("cwd", os.getcwd())
+    message = {"jsonrpc": "2.0", "id": next(_ids), "method": method, "params": params}
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path or getSocketPath()))
+        with sock.makefile("rwb") as stream:
+            stream.write(json.dumps(message).encode() + b"\n")
+            stream.flush()
+            line = stream.readline()
+
+    if not line:
+        raise RemoteError(0, "Connection closed by the server")
+    response = json.loads(line)
+    if "error" in response:
+        error = response["error"]
+        raise RemoteError(error["code"], error["message"], error.get("data"))
+    return response["result"]
+
+
+def parseValue(value: str):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def main(argv: list[str] | None = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(__doc__, file=sys.stderr)
+        return 2
+
+    params = {}
+    for item in argv[1:]:
+        key, sep, value = item.partition("=")
+        if not sep:
+            print(f"Invalid parameter {item}, expect KEY=VALUE.", file=sys.stderr)
+            return 2
+        params[key] = parseValue(value)
+
+    try:
+        result = request(argv[0], params)
+    except (OSError, RemoteError) as ex:
+        print(f"Failed to request {argv[0]}: {ex}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(result, indent=2))
+    failed = isinstance(result, dict) and result.get("state") == "Failure"
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,288 @@
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import threading
+from datetime import datetime
+from logging import Logger
+from pathlib import Path
+from timeit import default_timer
+from typing import Any, Callable
+
+from ... import getEnvironmentManager
+from ...io import FileProductIO
+from ...io.gzip import GzipFileProductIO, GzipStreamAutoProductLoader
+from ...models import (ApiDescription, ApiDifference, Distribution,
+                       ProduceState, Product)
+from ...producers import ProduceContext, produce
+from ...services import ServiceProvider
+from . import (INTERNAL_ERROR, INVALID_PARAMS, INVALID_REQUEST,
+               METHOD_NOT_FOUND, PARSE_ERROR)
+
+
+class ProductCache:
+    """Bounded LRU of products parsed from files, validated by mtime and size."""
+
+    def __init__(self, /, size: int = 32) -> None:
+        self.size = max(1, size)
+        self.items: dict[tuple[Path, type], tuple[int, int, Product]] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get[P: Product](self, /, path: Path, cls: type[P]) -> P:
+        stat = path.stat()
+        key = path, cls
+        with self.lock:
+            item = self.items.pop(key, None)
+            if item is not None and item[:2] == (stat.st_mtime_ns, stat.st_size):
+                self.items[key] = item
+                self.hits += 1
+                return item[2]  # type: ignore
+            self.misses += 1
+
+        with path.open("rb") as f:
+            result = GzipStreamAutoProductLoader(f).load(cls)
+
+        with self.lock:
+            self.items[key] = stat.st_mtime_ns, stat.st_size, result
+            while len(self.items) > self.size:
+                self.items.pop(next(iter(self.items)))
+        return result
+
+
+class RequestError(Exception):
+    def __init__(self, /, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class AexpyServer:
+    """Resident server answering JSON-RPC requests with a warm service.
+
+    At most jobs requests are produced at the same time, each captures its log
+    by a logger reserved for its slot, and saves it beside the output file."""
+
+    def __init__(
+        self,
+        /,
+        service: ServiceProvider,
+        logger: Logger | None = None,
+        jobs: int = 2,
+        cacheSize: int = 32,
+        compress: bool = False,
+    ) -> None:
+        self.service = service
+        self.logger = (
+            logger.getChild("serve")
+            if logger is not None
+            else logging.getLogger("serve")
+        )
+        self.jobs = max(1, jobs)
+        self.compress = compress
+        self.cache = ProductCache(cacheSize)
+        self.slots: queue.SimpleQueue[int] = queue.SimpleQueue()
+        for slot in range(self.jobs):
+            self.slots.put(slot)
+        self.lock = threading.Lock()
+        self.active = 0
+        self.served = 0
+        self.failed = 0
+        self.started = datetime.now()
+        self.server: socketserver.UnixStreamServer | None = None
+        self.methods: dict[str, Callable[[dict[str, Any], Logger], Any]] = {
+            "preprocess": self.preprocess,
+            "extract": self.extract,
+            "diff": self.diff,
+            "report": self.report,
+            "stat": self.stat,
+        }
+
+    def warmup(self, /):
+        """Import producers and probe the environment manager before serving."""
+
+        start = default_timer()
+        self.service.preprocessor(self.logger)
+        self.service.extractor(self.logger)
+        self.service.differ(self.logger)
+        self.service.reporter(self.logger)
+        getEnvironmentManager()
+        self.logger.info(f"Warmed up in {default_timer() - start:.3f}s.")
+
+    def path(self, /, params: dict[str, Any], name: str, exists: bool = True) -> Path:
+        value = params.get(name)
+        if not isinstance(value, str) or not value:
+            raise RequestError(INVALID_PARAMS, f"Parameter {name} should be a path.")
+        result = Path(params.get("cwd") or os.getcwd(), value).resolve()
+        if exists and not result.exists():
+            raise RequestError(INVALID_PARAMS, f"Parameter {name}: {result} not found.")
+        return result
+
+    def save(self, /, context: ProduceContext, output: Path):
+        io = GzipFileProductIO if self.compress else FileProductIO
+        io(output, output.with_suffix(".log")).save(context.product, context.log)
+
+    def preprocess(self, /, params: dict[str, Any], logger: Logger):
+        from ...cli import preprocessCore
+
+        return preprocessCore(
+            service=self.service,
+            path=self.path(params, "path"),
+            module=list(params.get("module", [])),
+            project=params.get("project", ""),
+            pyversion=params.get("pyversion", ""),
+            mode=params.get("mode", "src"),
+            logger=logger,
+            selective=bool(params.get("selective", False)),
+        )
+
+    def extract(self, /, params: dict[str, Any], logger: Logger):
+        from ...cli import extractCore
+
+        return extractCore(
+            service=self.service,
+            data=self.cache.get(self.path(params, "distribution"), Distribution),
+            env=params.get("env", ""),
+            temp=bool(params.get("temp", False)),
+            logger=logger,
+        )
+
+    def diff(self, /, params: dict[str, Any], logger: Logger):
+        return self.service.diff(
+            self.cache.get(self.path(params, "old"), ApiDescription),
+            self.cache.get(self.path(params, "new"), ApiDescription),
+            logger=logger,
+        )
+
+    def report(self, /, params: dict[str, Any], logger: Logger):
+        return self.service.report(
+            self.cache.get(self.path(params, "difference"), ApiDifference),
+            logger=logger,
+        )
+
+    def stat(self, /, params: dict[str, Any], logger: Logger):
+        from ..stats import StatisticianWorker, StatSummary
+
+        files = params.get("files")
+        if not isinstance(files, list):
+            raise RequestError(INVALID_PARAMS, "Parameter files should be a list.")
+        paths = [self.path({**params, "file": item}, "file") for item in files]
+        with produce(StatSummary(), logger, service=self.service.name) as context:
+            with context.using(StatisticianWorker(logger=context.logger)) as worker:
+                worker.count(paths, context.product)
+        return context
+
+    def status(self, /):
+        with self.lock:
+            return {
+                "service": self.service.name,
+                "pid": os.getpid(),
+                "started": self.started.isoformat(),
+                "jobs": self.jobs,
+                "active": self.active,
+                "served": self.served,
+                "failed": self.failed,
+                "cache": {
+                    "items": len(self.cache.items),
+                    "hits": self.cache.hits,
+                    "misses": self.cache.misses,
+                },
+            }
+
+    def call(self, /, method: str, params: dict[str, Any]) -> Any:
+        if method == "status":
+            return self.status()
+        if method == "shutdown":
+            if self.server is not None:
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return True
+        func = self.methods.get(method)
+        if func is None:
+            raise RequestError(METHOD_NOT_FOUND, f"Method {method} not found.")
+        output = self.path(params, "output", exists=False)
+
+        slot = self.slots.get()
+        with self.lock:
+            self.active += 1
+        start = default_timer()
+        try:
+            context: ProduceContext = func(params, self.logger.getChild(f"slot{slot}"))
+            self.save(context, output)
+        finally:
+            with self.lock:
+                self.active -= 1
+            self.slots.put(slot)
+
+        product = context.product
+        with self.lock:
+            self.served += 1
+            if product.state != ProduceState.Success:
+                self.failed += 1
+        elapsed = default_timer() - start
+        self.logger.info(f"Served {method} ({product.state.name}) in {elapsed:.3f}s.")
+        return {
+            "state": product.state.name,
+            "output": str(output),
+            "log": str(output.with_suffix(".log")),
+            "overview": product.overview(),
+        }
+
+    def handle(self, /, line: bytes) -> dict[str, Any]:
+        id = None
+        try:
+            try:
+                message = json.loads(line)
+            except ValueError as ex:
+                raise RequestError(PARSE_ERROR, f"Invalid JSON: {ex}.")
+            if not isinstance(message, dict) or not isinstance(
+                message.get("method"), str
+            ):
+                raise RequestError(INVALID_REQUEST, "Invalid request.")
+            id = message.get("id")
+            params = message.get("params") or {}
+            if not isinstance(params, dict):
+                raise RequestError(INVALID_PARAMS, "Parameters should be an object.")
+            result = self.call(message["method"], params)
+            return {"jsonrpc": "2.0", "id": id, "result": result}
+        except RequestError as ex:
+            error = {"code": ex.code, "message": str(ex)}
+        except Exception as ex:
+            self.logger.error(f"Failed to handle request {id}.", exc_info=True)
+            error = {"code": INTERNAL_ERROR, "message": f"{type(ex).__name__}: {ex}"}
+        return {"jsonrpc": "2.0", "id": id, "error": error}
+
+    def serve(self, /, path: Path):
+        """Serve on the unix socket until a shutdown request."""
+
+        if path.exists():
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                try:
+                    sock.connect(str(path))
+                except OSError:
+                    path.unlink()
+                else:
+                    raise Exception(f"Another server is listening on {path}.")
+
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self, /):
+                while line := self.rfile.readline():
+                    if line.strip():
+                        response = server.handle(line)
+                        self.wfile.write(json.dumps(response).encode() + b"\n")
+                        self.wfile.flush()
+
+        self.warmup()
+        with socketserver.ThreadingUnixStreamServer(str(path), Handler) as unix:
+            unix.daemon_threads = True
+            os.chmod(path, 0o600)
+            self.server = unix
+            self.logger.info(f"Serving on {path} with {self.jobs} jobs.")
+            try:
+                unix.serve_forever()
+            finally:
+                self.server = None
+                path.unlink(missing_ok=True)
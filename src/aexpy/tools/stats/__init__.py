@@ -1,12 +1,16 @@
 import functools
+import gzip
 import inspect
 import json
 import logging
+import multiprocessing
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from logging import Logger
 from pathlib import Path
-from typing import Callable, Iterable, cast, override
+from typing import Any, Callable, Iterable, cast, override
+
+from pydantic_core import from_json
 
 from ...io import LoadSourceType, load
 from ...models import (ApiDescription, ApiDifference, CoreProduct,
@@ -16,6 +20,8 @@ from ...producers import Producer
 
 type StatDataType = dict[str, dict[str, float | dict[str, float]]]
 
+HEADER_SIZE = 1 << 16
+
 
 class StatSummary(Product):
     dists: StatDataType = {}
@@ -40,7 +46,20 @@ type CounterType[T, R: (float, dict[str, float], float | dict[str, float])] = Ca
 ]
 
 
+def reads[F: Callable](*fields: str) -> Callable[[F], F]:
+    """Declare the product fields read by a counter, so products can be loaded with only these fields."""
+
+    def decorator(func: F) -> F:
+        setattr(func, "reads", frozenset(fields))
+        return func
+
+    return decorator
+
+
 class Statistician[T](ABC):
+    idFields: tuple[str, ...] = ()
+    """Product fields read to get the id."""
+
     def __init__(self, /):
         self.data: StatDataType = defaultdict(dict)
         self.counters: list[CounterType[T, float | dict[str, float]]] = []
@@ -80,6 +99,25 @@ class Statistician[T](ABC):
     def keys(self, /):
         return (c.__name__ for c in self.counters)
 
+    def header(self, /) -> set[str] | None:
+        """Return the fields read by the id and all counters, None if any counter reads the whole product."""
+
+        result = set(self.idFields)
+        for counter in self.counters:
+            fields: frozenset[str] | None = getattr(counter, "reads", None)
+            if fields is None:
+                return None
+            result.update(fields)
+        return result
+
+    def merge(self, /, data: StatDataType):
+        """Merge partial data counted elsewhere, values counted here are kept."""
+
+        for id, values in data.items():
+            cached = self.data[id]
+            for key, value in values.items():
+                cached.setdefault(key, value)
+
     def values(self, /, key: str):
         for data in self.data.values():
             value = data.get(key, None)
@@ -100,19 +138,42 @@ class PairProductStatistician[T: PairProduct](Statistician[T]):
 
 
 class DistStatistician(SingleProductStatistician[Distribution]):
-    pass
+    idFields = ("release",)
 
 
 class ApiStatistician(SingleProductStatistician[ApiDescription]):
-    pass
+    idFields = ("distribution",)
 
 
 class ChangeStatistician(PairProductStatistician[ApiDifference]):
-    pass
+    idFields = ("old", "new")
 
 
 class ReportStatistician(PairProductStatistician[Report]):
-    pass
+    idFields = ("old", "new")
+
+
+def productType(data: dict[str, Any], complete: bool) -> type[CoreProduct] | None:
+    """Detect the product type from a header like load, None if not decidable."""
+
+    if "release" in data:
+        return Distribution
+    elif "distribution" in data:
+        return ApiDescription
+    elif "entries" in data:
+        return ApiDifference
+    elif complete or "content" in data:
+        return Report
+    return None
+
+
+_forked: "StatisticianWorker | None" = None
+"""Worker state inherited by forked processes."""
+
+
+def _countShard(sources: list[LoadSourceType]):
+    assert _forked is not None
+    return _forked.shard(sources)
 
 
 class StatisticianWorker(Producer):
@@ -124,6 +185,8 @@ class StatisticianWorker(Producer):
         apis: Statistician[ApiDescription] | None = None,
         changes: Statistician[ApiDifference] | None = None,
         reports: Statistician[Report] | None = None,
+        jobs: int = 1,
+        header: bool = True,
     ):
         super().__init__(logger)
         from . import apis as Mapis
@@ -135,30 +198,114 @@ class StatisticianWorker(Producer):
         self.apis = (apis or Mapis.S).renew()
         self.changes = (changes or Mchanges.S).renew()
         self.reports = (reports or Mreports.S).renew()
+        self.jobs = jobs
+        """Count of forked processes sharding file sources, 1 to count in this process."""
+        self.header = header
+        """Load files with only the fields read by counters when possible."""
+
+    def statisticians(self, /) -> tuple[Statistician, ...]:
+        return self.dists, self.apis, self.changes, self.reports
+
+    def statistician(self, /, cls: type[CoreProduct]) -> Statistician:
+        return {
+            Distribution: self.dists,
+            ApiDescription: self.apis,
+            ApiDifference: self.changes,
+            Report: self.reports,
+        }[cls]
+
+    def loadHeader(self, /, path: Path) -> CoreProduct:
+        """Load a product file with only the fields read by counters if they are in the leading bytes.
+
+        The last field of an incomplete header may be truncated, so it is never used."""
+
+        with path.open("rb") as raw:
+            compressed = raw.read(2) == b"\x1f\x8b"
+            raw.seek(0)
+            stream = gzip.GzipFile(fileobj=raw) if compressed else raw
+            content = stream.read(HEADER_SIZE + 1)
+            complete = len(content) <= HEADER_SIZE
+            header = from_json(
+                content[:HEADER_SIZE],
+                allow_partial="trailing-strings" if not complete else False,
+            )
+            assert isinstance(header, dict), f"Not a valid data type: {type(header)}"
+            cls = productType(header, complete)
+
+            if cls is not None and not complete:
+                fields = self.statistician(cls).header()
+                last = next(reversed(header), None)
+                if fields is not None and all(
+                    f in header and f != last for f in fields
+                ):
+                    return cls.model_validate({f: header[f] for f in fields})
+            if not complete:
+                content += stream.read()
+
+        if cls is None:
+            return load(content)
+        if complete:
+            return cls.model_validate(header)
+        return cls.model_validate_json(content)
+
+    def load(self, /, source: LoadSourceType | CoreProduct) -> CoreProduct:
+        match source:
+            case Distribution() | ApiDescription() | ApiDifference() | Report():
+                return source
+            case Path() if self.header:
+                return self.loadHeader(source)
+            case _:
+                return load(source)
+
+    def collect(self, /, sources: Iterable[LoadSourceType | CoreProduct]):
+        for source in sources:
+            try:
+                product = self.load(source)
+                self.statistician(type(product)).collect(product)
+            except Exception:
+                self.logger.error(f"Failed to collect from {source}", exc_info=True)
+
+    def shard(self, /, sources: list[LoadSourceType]):
+        """Count the sources by renewed statisticians, and return their partial data."""
+
+        self.dists, self.apis, self.changes, self.reports = (
+            item.renew() for item in self.statisticians()
+        )
+        self.collect(sources)
+        return tuple(dict(item.data) for item in self.statisticians())
 
     def count(
         self, /, sources: Iterable[LoadSourceType | CoreProduct], product: StatSummary
     ):
-        def autoLoad(source: LoadSourceType | CoreProduct):
-            match source:
-                case Distribution() | ApiDescription() | ApiDifference() | Report():
-                    return source
-                case _:
-                    return load(source)
+        sources = list(sources)
+        files = [item for item in sources if isinstance(item, Path)]
 
-        for source in sources:
+        parallel = self.jobs > 1 and len(files) > 1
+        if parallel and "fork" not in multiprocessing.get_all_start_methods():
+            self.logger.warning("Fork is not supported, count files in process.")
+            parallel = False
+
+        if parallel:
+            global _forked
+
+            self.collect(item for item in sources if not isinstance(item, Path))
+
+            size = max(1, min(256, len(files) // (self.jobs * 4)))
+            shards = [files[i : i + size] for i in range(0, len(files), size)]
+            self.logger.info(
+                f"Count {len(files)} files in {len(shards)} shards by {self.jobs} processes."
+            )
+
+            _forked = self
             try:
-                source = autoLoad(source)
-                if isinstance(source, Distribution):
-                    self.dists.collect(source)
-                if isinstance(source, ApiDescription):
-                    self.apis.collect(source)
-                if isinstance(source, ApiDifference):
-                    self.changes.collect(source)
-                if isinstance(source, Report):
-                    self.reports.collect(source)
-            except Exception:
-                self.logger.error(f"Failed to collect from {source}", exc_info=True)
+                with multiprocessing.get_context("fork").Pool(self.jobs) as pool:
+                    for parts in pool.imap(_countShard, shards):
+                        for item, part in zip(self.statisticians(), parts):
+                            item.merge(part)
+            finally:
+                _forked = None
+        else:
+            self.collect(sources)
 
         product.dists.update(self.dists.data)
         product.apis.update(self.apis.data)
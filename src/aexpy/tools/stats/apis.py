@@ -1,7 +1,7 @@
 from ...models import ApiDescription
 from ...models.description import (ClassFlag, FunctionFlag, ItemScope,
                                    ParameterKind)
-from . import ApiStatistician
+from . import ApiStatistician, reads
 
 S = ApiStatistician()
 
@@ -12,121 +12,145 @@ S.count(success)
 
 
 @S.count
+@reads("modules", "classes", "functions", "attributes", "specials")
 def private(data: ApiDescription):
     return sum(1 for e in data if e.private)
 
 
 @S.count
+@reads("modules", "classes", "functions", "attributes", "specials")
 def public(data: ApiDescription):
     return len(data) - private(data)
 
 
 @S.count
+@reads("functions")
 def functions(data: ApiDescription):
     return len(data.functions)
 
 
 @S.count
+@reads("classes")
 def classes(data: ApiDescription):
     return len(data.classes)
 
 
 @S.count
+@reads("modules")
 def modules(data: ApiDescription):
     return len(data.modules)
 
 
 @S.count
+@reads("attributes")
 def attributes(data: ApiDescription):
     return len(data.attributes)
 
 
 @S.count
+@reads("functions")
 def pri_functions(data: ApiDescription):
     return sum(1 for e in data.functions.values() if e.private)
 
 
 @S.count
+@reads("classes")
 def pri_classes(data: ApiDescription):
     return sum(1 for e in data.classes.values() if e.private)
 
 
 @S.count
+@reads("modules")
 def pri_modules(data: ApiDescription):
     return sum(1 for e in data.modules.values() if e.private)
 
 
 @S.count
+@reads("attributes")
 def pri_attributes(data: ApiDescription):
     return sum(1 for e in data.attributes.values() if e.private)
 
 
 @S.count
+@reads("functions")
 def pub_functions(data: ApiDescription):
     return functions(data) - pri_functions(data)
 
 
 @S.count
+@reads("classes")
 def pub_classes(data: ApiDescription):
     return classes(data) - pri_classes(data)
 
 
 @S.count
+@reads("modules")
 def pub_modules(data: ApiDescription):
     return modules(data) - pri_modules(data)
 
 
 @S.count
+@reads("attributes")
 def pub_attributes(data: ApiDescription):
     return attributes(data) - pri_attributes(data)
 
 
 @S.count
+@reads("classes")
 def abstract_classes(data: ApiDescription):
     return sum(1 for e in data.classes.values() if ClassFlag.Abstract in e.flags)
 
 
 @S.count
+@reads("classes")
 def generic_classes(data: ApiDescription):
     return sum(1 for e in data.classes.values() if ClassFlag.Generic in e.flags)
 
 
 @S.count
+@reads("classes")
 def final_classes(data: ApiDescription):
     return sum(1 for e in data.classes.values() if ClassFlag.Final in e.flags)
 
 
 @S.count
+@reads("classes")
 def data_classes(data: ApiDescription):
     return sum(1 for e in data.classes.values() if ClassFlag.Dataclass in e.flags)
 
 
 @S.count
+@reads("functions")
 def abstract_functions(data: ApiDescription):
     return sum(1 for e in data.functions.values() if FunctionFlag.Abstract in e.flags)
 
 
 @S.count
+@reads("functions")
 def generic_functions(data: ApiDescription):
     return sum(1 for e in data.functions.values() if FunctionFlag.Generic in e.flags)
 
 
 @S.count
+@reads("functions")
 def final_functions(data: ApiDescription):
     return sum(1 for e in data.functions.values() if FunctionFlag.Final in e.flags)
 
 
 @S.count
+@reads("functions")
 def async_functions(data: ApiDescription):
     return sum(1 for e in data.functions.values() if FunctionFlag.Async in e.flags)
 
 
 @S.count
+@reads("functions")
 def override_functions(data: ApiDescription):
     return sum(1 for e in data.functions.values() if FunctionFlag.Override in e.flags)
 
 
 @S.count
+@reads("functions")
 def function_scopes(data: ApiDescription):
     return {
         scope.name: float(sum(1 for e in data.functions.values() if e.scope == scope))
@@ -135,6 +159,7 @@ def function_scopes(data: ApiDescription):
 
 
 @S.count
+@reads("attributes")
 def attribute_scopes(data: ApiDescription):
     return {
         scope.name: float(sum(1 for e in data.attributes.values() if e.scope == scope))
@@ -143,11 +168,13 @@ def attribute_scopes(data: ApiDescription):
 
 
 @S.count
+@reads("functions")
 def parameters(data: ApiDescription):
     return sum(len(e.parameters) for e in data.functions.values())
 
 
 @S.count
+@reads("functions")
 def parameter_kinds(data: ApiDescription):
     return {
         kind.name: float(
@@ -161,6 +188,7 @@ def parameter_kinds(data: ApiDescription):
 
 
 @S.count
+@reads("functions")
 def fixed_parameters(data: ApiDescription):
     counted = parameter_kinds(data)
     return sum(
@@ -174,11 +202,13 @@ def fixed_parameters(data: ApiDescription):
 
 
 @S.count
+@reads("functions")
 def var_parameters(data: ApiDescription):
     return parameters(data) - fixed_parameters(data)
 
 
 @S.count
+@reads("functions")
 def typed_parameters(data: ApiDescription):
     return sum(
         sum(1 for p in e.parameters if p.type is not None)
@@ -187,11 +217,13 @@ def typed_parameters(data: ApiDescription):
 
 
 @S.count
+@reads("functions")
 def untyped_parameters(data: ApiDescription):
     return parameters(data) - typed_parameters(data)
 
 
 @S.count
+@reads("functions")
 def typed_functions(data: ApiDescription):
     return sum(
         1
@@ -201,15 +233,18 @@ def typed_functions(data: ApiDescription):
 
 
 @S.count
+@reads("functions")
 def untyped_functions(data: ApiDescription):
     return len(data.functions) - typed_functions(data)
 
 
 @S.count
+@reads("attributes")
 def typed_attributes(data: ApiDescription):
     return sum(1 for e in data.attributes.values() if e.type is not None)
 
 
 @S.count
+@reads("attributes")
 def untyped_attributes(data: ApiDescription):
     return len(data.attributes) - typed_attributes(data)
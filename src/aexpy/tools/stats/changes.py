@@ -1,6 +1,6 @@
 from ...models import ApiDifference
 from ...models.difference import BreakingRank
-from . import ChangeStatistician
+from . import ChangeStatistician, reads
 
 S = ChangeStatistician()
 
@@ -11,11 +11,13 @@ S.count(success)
 
 
 @S.count
+@reads("entries")
 def kinds(data: ApiDifference):
-    return {k: float(len(data.kind(k))) for k in data.kinds()}
+    return {k: float(len(v)) for k, v in data.entryGroups[1].items()}
 
 
 @S.count
+@reads("entries")
 def breaking_kinds(data: ApiDifference):
     entries = data.breaking(BreakingRank.Low)
     return {
@@ -25,10 +27,13 @@ def breaking_kinds(data: ApiDifference):
 
 
 @S.count
+@reads("entries")
 def ranks(data: ApiDifference):
-    return {k.name: float(len(data.rank(k))) for k in BreakingRank}
+    ranks = data.entryGroups[0]
+    return {k.name: float(len(ranks.get(k, ()))) for k in BreakingRank}
 
 
 @S.count
+@reads("entries")
 def breaking(data: ApiDifference):
     return sum(breaking_kinds(data).values())
@@ -20,7 +20,25 @@ from . import StatisticianWorker, StatSummary
     ),
 )
 @click.argument("output", type=click.File("wb"))
-def stat(ctx: click.Context, files: tuple[Path], output: IO[bytes]):
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(1),
+    default=1,
+    help="Count of worker processes sharding the files.",
+)
+@click.option(
+    "--header/--no-header",
+    default=True,
+    help="Load only the fields read by counters when possible.",
+)
+def stat(
+    ctx: click.Context,
+    files: tuple[Path],
+    output: IO[bytes],
+    jobs: int = 1,
+    header: bool = True,
+):
     """Count from produced data.
 
     FILES give paths to produced data for count.
@@ -30,11 +48,15 @@ def stat(ctx: click.Context, files: tuple[Path], output: IO[bytes]):
     Examples:
 
     aexpy tool stat data/*.json stats.json
+
+    aexpy tool stat -j 8 data/*.json stats.json
     """
     clictx = ctx.ensure_object(CliContext)
 
     with produce(StatSummary(), service=clictx.service.name) as context:
-        with context.using(StatisticianWorker(logger=context.logger)) as worker:
+        with context.using(
+            StatisticianWorker(logger=context.logger, jobs=jobs, header=header)
+        ) as worker:
             worker.count(files, context.product)
 
     result = context.product
@@ -1,5 +1,5 @@
 from ...models import Distribution
-from . import DistStatistician
+from . import DistStatistician, reads
 
 S = DistStatistician()
 
@@ -10,31 +10,37 @@ S.count(success)
 
 
 @S.count
+@reads("locCount")
 def loc(data: Distribution):
     return data.locCount
 
 
 @S.count
+@reads("fileSize")
 def filesize(data: Distribution):
     return data.fileSize
 
 
 @S.count
+@reads("fileCount")
 def filecount(data: Distribution):
     return data.fileCount
 
 
 @S.count
+@reads("dependencies")
 def dependencies(data: Distribution):
     return len(data.dependencies)
 
 
 @S.count
+@reads("topModules")
 def topmodules(data: Distribution):
     return len(data.topModules)
 
 
 @S.count
+@reads("pyversion")
 def pyversion(data: Distribution):
     try:
         return int(data.pyversion.split(".")[1])
@@ -1,9 +1,12 @@
 from ...models import Product
+from . import reads
 
 
+@reads("duration")
 def duration(data: Product):
     return data.duration.total_seconds()
 
 
+@reads("state")
 def success(data: Product):
     return int(data.success)
@@ -0,0 +1,38 @@
+from aexpy.tools.batch import parseSpec, versionKey
+
+
+def test_version_order():
+    versions = [
+        "1.0.dev1",
+        "1.0a1",
+        "1.0a2.dev1",
+        "1.0b1",
+        "1.0rc1",
+        "1.0rc2",
+        "1.0",
+        "1.0.post1.dev1",
+        "1.0.post1",
+        "1.0.post2",
+        "1.1.dev0",
+        "1.1",
+        "1.9",
+        "1.10",
+        "1!0.1",
+    ]
+
+    for lower, upper in zip(versions, versions[1:]):
+        assert versionKey(lower) < versionKey(upper), (lower, upper)
+    assert sorted(reversed(versions), key=versionKey) == versions
+
+
+def test_version_normalized():
+    assert versionKey("1.0") == versionKey("1.0.0")
+    assert versionKey("1.0RC1") == versionKey("1.0rc1") == versionKey("1.0-c1")
+    assert versionKey("1.0-1") == versionKey("1.0.post1")
+
+
+def test_spec_range():
+    _, accepts = parseSpec("demo@1.0..2.0")
+
+    assert accepts("1.0") and accepts("1.5.post1") and accepts("2.0")
+    assert not accepts("1.0rc1") and not accepts("2.0.post1")
@@ -0,0 +1,56 @@
+import json
+import pickle
+
+from aexpy.extracting.enriching.callgraph import (Argument, Caller, Callgraph,
+                                                  Callsite)
+
+
+def buildCallgraph():
+    result = Callgraph()
+    result.add(
+        Caller(
+            id="pkg.main",
+            sites=[
+                Callsite(
+                    targets=["pkg.helper", "pkg.Point.norm"],
+                    arguments=[
+                        Argument("x", "value", False, "value"),
+                        Argument("", "options", True, "**options"),
+                    ],
+                    raw="helper(x=value, **options)",
+                ),
+                Callsite(targets=["pkg.helper"], raw="helper()"),
+            ],
+        )
+    )
+    result.add(Caller(id="pkg.helper", sites=[Callsite(targets=["pkg.main"])]))
+    result.add(Caller(id="pkg.empty"))
+    return result
+
+
+def test_dump_load_roundtrip():
+    graph = buildCallgraph()
+
+    data = json.loads(json.dumps(graph.dump()))
+    loaded = Callgraph.load(data)
+
+    assert loaded.ids == graph.ids
+    assert loaded.index == graph.index
+    assert loaded.items == graph.items
+    assert loaded.adjacency() == graph.adjacency()
+    assert loaded.callees("pkg.main") == ["pkg.helper", "pkg.Point.norm"]
+    assert loaded.callers() == graph.callers()
+    assert loaded.dump() == data
+
+
+def test_pickle_roundtrip():
+    graph = buildCallgraph()
+
+    loaded = pickle.loads(pickle.dumps(graph))
+
+    assert loaded.items == graph.items
+    assert loaded.callers() == {
+        "pkg.helper": ["pkg.main"],
+        "pkg.Point.norm": ["pkg.main"],
+        "pkg.main": ["pkg.helper"],
+    }
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from aexpy.models import Distribution
+from aexpy.preprocessing.counter import FileCounterPreprocessor, countLines
+
+SOURCES = [
+    "",
+    "a = 1",
+    "a = 1\n",
+    "a = 1\n\nb = 2\n",
+    "a = 1\r\nb = 2\r\n",
+    "a = 1\rb = 2",
+    "a = 1\x0c\nb = 2\n",
+    "s = ' '\nt = '\x85'\n",
+    "# 注释\nx = 1\n",
+]
+
+
+def test_count_lines_as_splitlines(tmp_path: Path):
+    for index, source in enumerate(SOURCES):
+        file = tmp_path / f"m{index}.py"
+        file.write_bytes(source.encode())
+        assert countLines(str(file)) == len(file.read_text().splitlines()), source
+
+
+def test_counter_cache(tmp_path: Path):
+    root = tmp_path / "src"
+    (root / "pkg").mkdir(parents=True)
+    (root / "pkg" / "__init__.py").write_text("a = 1\nb = 2\n")
+    (root / "pkg" / "mod.py").write_text("a = 1\r\nb = 2\rc = 3")
+    cache = tmp_path / "cache"
+
+    def count():
+        product = Distribution(rootPath=root, topModules=["pkg"])
+        FileCounterPreprocessor(cacheDir=cache).preprocess(product)
+        return product.fileCount, product.locCount
+
+    assert count() == (2, 5)
+    assert len(list((cache / "counter").iterdir())) == 1
+    assert count() == (2, 5)
+    assert FileCounterPreprocessor().cacheFile(root) is None
@@ -0,0 +1,49 @@
+from aexpy.models import ApiDifference
+from aexpy.models.difference import BreakingRank, DiffEntry
+
+RANKS = [
+    BreakingRank.Low,
+    BreakingRank.High,
+    BreakingRank.Compatible,
+    BreakingRank.Medium,
+    BreakingRank.Low,
+    BreakingRank.Unknown,
+    BreakingRank.High,
+]
+
+
+def buildDifference():
+    result = ApiDifference()
+    for index, rank in enumerate(RANKS):
+        result.entries[f"e{index}"] = DiffEntry(
+            id=f"e{index}", kind=f"K{index % 2}", rank=rank
+        )
+    return result
+
+
+def test_breaking_keeps_entry_order():
+    diff = buildDifference()
+
+    for rank in BreakingRank:
+        assert diff.breaking(rank) == [
+            entry for entry in diff.entries.values() if entry.rank >= rank
+        ]
+    assert [entry.id for entry in diff.breaking(BreakingRank.Medium)] == [
+        "e1",
+        "e3",
+        "e6",
+    ]
+
+
+def test_breaking_after_clear_cache():
+    diff = buildDifference()
+    assert len(diff.breaking(BreakingRank.High)) == 2
+
+    diff.entries["e0"].rank = BreakingRank.High
+    diff.clearCache()
+
+    assert [entry.id for entry in diff.breaking(BreakingRank.High)] == [
+        "e0",
+        "e1",
+        "e6",
+    ]
@@ -0,0 +1,82 @@
+import shutil
+import zipfile
+from pathlib import Path
+
+from aexpy.cli import extractCore, preprocessCore
+from aexpy.diffing.differs.default import ConstraintDiffer
+from aexpy.models import ApiDescription, ProduceState
+from aexpy.services import ServiceProvider
+
+SOURCE = '''"""A package for digests."""
+
+
+def greet(name: str, *, loud: bool = False) -> str:
+    """Greet someone."""
+    return name.upper() if loud else name
+
+
+class Point:
+    """A point."""
+
+    __slots__ = ("x", "y", "z", "w")
+
+    def __init__(self, x: int = 0, y: int = 0):
+        self.x = x
+        self.y = y
+
+    def norm(self) -> int:
+        return abs(self.x) + abs(self.y)
+'''
+
+
+def buildWheel(target: Path) -> Path:
+    wheel = target / "digestpkg-1.0-py3-none-any.whl"
+    with zipfile.ZipFile(wheel, "w") as file:
+        file.writestr("digestpkg/__init__.py", SOURCE)
+        file.writestr(
+            "digestpkg-1.0.dist-info/METADATA",
+            "Metadata-Version: 2.1\nName: digestpkg\nVersion: 1.0\n",
+        )
+        file.writestr(
+            "digestpkg-1.0.dist-info/WHEEL",
+            "Wheel-Version: 1.0\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+        )
+        file.writestr("digestpkg-1.0.dist-info/top_level.txt", "digestpkg\n")
+        file.writestr("digestpkg-1.0.dist-info/RECORD", "")
+    return wheel
+
+
+def extractWheel(wheel: Path) -> ApiDescription:
+    service = ServiceProvider()
+    dist = preprocessCore(service, wheel, project="digestpkg@1.0", mode="wheel").product
+    assert dist.state == ProduceState.Success
+    api = extractCore(service, dist).product
+    assert api.state == ProduceState.Success
+    return api
+
+
+def extractTwice(tmp_path: Path):
+    wheel = buildWheel(tmp_path)
+    results = []
+    for name in ("first", "second"):
+        # different unpack paths give different locations and producer data
+        target = tmp_path / name
+        target.mkdir()
+        results.append(extractWheel(Path(shutil.copy(wheel, target))))
+    return results[0], results[1]
+
+
+def test_same_wheel_same_digests(tmp_path: Path):
+    old, new = extractTwice(tmp_path)
+
+    assert old.functions and old.classes
+    assert old.digest and old.digest == new.digest
+    assert old.digests and old.digests == new.digests
+
+
+def test_same_wheel_pruned(tmp_path: Path):
+    old, new = extractTwice(tmp_path)
+
+    pruned = ConstraintDiffer().pruned(old, new)
+
+    assert pruned == {entry.id for entry in old}
@@ -0,0 +1,46 @@
+from aexpy.preprocessing.download import selectWheel
+from aexpy.preprocessing.wheel import supportsPython
+
+
+def wheel(filename: str, requires: str = "", yanked: bool = False):
+    return {
+        "filename": filename,
+        "url": f"https://files.example/{filename}",
+        "packagetype": "bdist_wheel",
+        "digests": {"sha256": "", "md5": ""},
+        "requires_python": requires,
+        "yanked": yanked,
+    }
+
+
+def test_supports_python():
+    assert supportsPython(None, "3.12")
+    assert supportsPython(">=3.8", "3.12")
+    assert not supportsPython(">=3.8, <3.12", "3.12")
+    assert supportsPython("<3.12.1", "3.12")
+    assert not supportsPython(">=2.7, !=3.0.*, !=3.12.*", "3.12")
+    assert supportsPython("~=3.10", "3.12")
+    assert not supportsPython("~=3.10.2", "3.12")
+    assert supportsPython("===3.12.0-custom", "3.12")
+
+
+def test_select_skips_yanked_and_requires_python():
+    files = [
+        wheel("demo-1.0-py3-none-any.whl", yanked=True),
+        wheel("demo-1.0-cp312-cp312-manylinux_2_17_x86_64.whl", "<3.12"),
+        wheel("demo-1.0-cp311-cp311-manylinux_2_17_x86_64.whl", ">=3.8"),
+    ]
+
+    item, pyversion = selectWheel(files, ["3.12", "3.11"])
+
+    assert pyversion == "3.11"
+    assert item["filename"].startswith("demo-1.0-cp311")
+
+
+def test_select_none_left():
+    files = [
+        wheel("demo-1.0-py3-none-any.whl", yanked=True),
+        wheel("demo-1.0-py3-none-any.whl", ">=3.13"),
+    ]
+
+    assert selectWheel(files, ["3.12", "3.11"]) is None
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+from aexpy.preprocessing.pypi import CACHE_FORMAT, MetadataCache
+
+
+def test_cache_root(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("AEXPY_PYPI_CACHE", str(tmp_path / "env"))
+
+    assert MetadataCache().root == tmp_path / "env"
+    assert MetadataCache(tmp_path / "given").root == tmp_path / "given"
+
+
+def test_cache_write(tmp_path: Path):
+    cache = MetadataCache(tmp_path)
+    file = cache.location("https://pypi.org/pypi/", "demo")
+    data = {"format": CACHE_FORMAT, "etag": None, "modified": None, "data": {}}
+
+    cache.write(file, data)
+
+    assert cache.read(file) == data
+
+
+def test_cache_write_failure(tmp_path: Path):
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    cache = MetadataCache(blocker)
+
+    cache.write(cache.location("https://pypi.org/pypi/", "demo"), {"data": {}})
+
+    assert blocker.read_text() == ""